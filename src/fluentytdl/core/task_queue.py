@@ -3,17 +3,21 @@ FluentYTDL 任务队列管理模块
 
 提供下载任务的状态管理、持久化和重试机制：
 - 任务状态模型 (DownloadTask)
-- JSON 持久化
+- JSON 快照 + JSONL 追加日志持久化
 - 自动重试逻辑
 - 程序重启后恢复
 """
 
 from __future__ import annotations
 
+import atexit
 import json
+import threading
+import time
 import uuid
+import weakref
 from collections.abc import Callable
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
@@ -21,6 +25,44 @@ from typing import Any
 
 from ..utils.logger import logger
 
+# 可选依赖 orjson：序列化更快且直接产出 UTF-8 bytes，缺失时回退到标准库 json
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    HAS_ORJSON = False
+
+
+# 合并写盘的延迟（秒）：窗口内的多次变更只落盘一次
+_SAVE_DELAY = 0.5
+
+# 追加日志超过快照的该倍数（且不小于下限）时重写快照
+_COMPACT_RATIO = 4
+_COMPACT_MIN_BYTES = 64 * 1024
+
+
+def _dumps(data: Any) -> bytes:
+    """序列化为缩进 2 空格的 UTF-8 JSON。"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _dumps_line(data: Any) -> bytes:
+    """序列化为单行 UTF-8 JSON（追加日志用）。"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(raw: bytes) -> Any:
+    """解析 UTF-8 JSON。"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
 
 class TaskStatus(Enum):
     """任务状态枚举"""
@@ -34,7 +76,7 @@ class TaskStatus(Enum):
     CANCELLED = "cancelled"  # 已取消
 
 
-@dataclass
+@dataclass(slots=True)
 class DownloadTask:
     """
     下载任务数据模型
@@ -79,15 +121,17 @@ class DownloadTask:
     completed_at: str | None = None
 
     def to_dict(self) -> dict[str, Any]:
-        """转换为可序列化的字典"""
-        return asdict(self)
+        """转换为可序列化的字典
+
+        浅拷贝：options 等容器与任务共享，调用方应立即序列化而不是修改返回值。
+        """
+        return {name: getattr(self, name) for name in _TASK_FIELDS}
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> DownloadTask:
         """从字典创建任务"""
         # 过滤掉未知字段
-        known_fields = {f.name for f in cls.__dataclass_fields__.values()}
-        filtered = {k: v for k, v in data.items() if k in known_fields}
+        filtered = {k: v for k, v in data.items() if k in _TASK_FIELD_SET}
         return cls(**filtered)
 
     def can_retry(self) -> bool:
@@ -126,6 +170,51 @@ class DownloadTask:
             self.eta = ""
 
 
+def _flush_at_exit(ref: weakref.ref[TaskQueue]) -> None:
+    """进程退出时写入仍在合并窗口内的变更（队列已被回收则跳过）"""
+    queue = ref()
+    if queue is not None:
+        queue.flush()
+
+
+def _notify_none() -> None:
+    pass
+
+
+def _compile_notify(callbacks: tuple[Callable[[], None], ...]) -> Callable[[], None]:
+    """将回调列表预先组合成一个通知函数（单个回调时不再走循环）"""
+    if not callbacks:
+        return _notify_none
+
+    if len(callbacks) == 1:
+        (only,) = callbacks
+
+        def notify_one() -> None:
+            try:
+                only()
+            except Exception as e:
+                logger.warning(f"任务变更回调失败: {e}")
+
+        return notify_one
+
+    def notify_all() -> None:
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"任务变更回调失败: {e}")
+
+    return notify_all
+
+
+# pending() 包含的状态
+_PENDING_STATUSES = frozenset({TaskStatus.PENDING.value, TaskStatus.QUEUED.value})
+
+# DownloadTask 的字段名，序列化/反序列化时复用
+_TASK_FIELDS = tuple(f.name for f in fields(DownloadTask))
+_TASK_FIELD_SET = frozenset(_TASK_FIELDS)
+
+
 class TaskQueue:
     """
     任务队列管理器
@@ -138,15 +227,30 @@ class TaskQueue:
         初始化任务队列
 
         Args:
-            persist_path: 持久化文件路径，None 则不持久化
+            persist_path: 持久化文件路径，None 则不持久化。
+                该文件保存全量快照，同名 .jsonl 文件保存之后的增量变更。
         """
         self._tasks: dict[str, DownloadTask] = {}
         self._persist_path = persist_path
+        self._log_path = persist_path.with_suffix(".jsonl") if persist_path else None
         self._on_change_callbacks: list[Callable[[], None]] = []
+        # 订阅者变化时重建的通知函数，热路径上直接调用
+        self._compiled_notify: Callable[[], None] = _notify_none
+
+        # 延迟落盘状态
+        # 变更发生时就在调用线程上序列化任务，定时器线程只写字节，
+        # 不会读到界面线程正在修改的任务（to_dict 是浅拷贝，options 与任务共享）
+        self._pending_lines: dict[str, bytes] = {}  # 任务 ID -> 待追加的日志行
+        self._task_json: dict[str, bytes] = {}  # 任务 ID -> 最近一次序列化结果（重写快照用）
+        self._flush_timer: threading.Timer | None = None
+        self._save_lock = threading.RLock()  # flush 内的快照重写会再次获取
 
         # 加载已保存的任务
-        if persist_path and persist_path.exists():
+        if persist_path:
             self._load()
+            # 延迟写盘由守护线程定时器触发，退出时不会等它：注册退出钩子兜底。
+            # 只持有弱引用，不延长队列的生命周期
+            atexit.register(_flush_at_exit, weakref.ref(self))
 
     def add(self, task: DownloadTask) -> str:
         """
@@ -160,7 +264,7 @@ class TaskQueue:
         """
         self._tasks[task.id] = task
         self._notify_change()
-        self._save()
+        self._save(task.id)
         return task.id
 
     def create(
@@ -208,7 +312,7 @@ class TaskQueue:
         if task_id in self._tasks:
             del self._tasks[task_id]
             self._notify_change()
-            self._save()
+            self._save(task_id)
             return True
         return False
 
@@ -217,23 +321,23 @@ class TaskQueue:
         if task.id in self._tasks:
             self._tasks[task.id] = task
             self._notify_change()
-            self._save()
+            self._save(task.id)
 
     def all(self) -> list[DownloadTask]:
         """获取所有任务"""
         return list(self._tasks.values())
 
     def by_status(self, status: TaskStatus) -> list[DownloadTask]:
-        """按状态筛选任务"""
-        return [t for t in self._tasks.values() if t.status == status.value]
+        """按状态筛选任务
+
+        按任务的实时状态逐个比较：直接改写 status 或未调用 update() 的任务同样能查到。
+        """
+        value = status.value
+        return [t for t in self._tasks.values() if t.status == value]
 
     def pending(self) -> list[DownloadTask]:
         """获取待处理任务"""
-        return [
-            t
-            for t in self._tasks.values()
-            if t.status in (TaskStatus.PENDING.value, TaskStatus.QUEUED.value)
-        ]
+        return [t for t in self._tasks.values() if t.status in _PENDING_STATUSES]
 
     def active(self) -> list[DownloadTask]:
         """获取活跃任务 (下载中)"""
@@ -258,42 +362,106 @@ class TaskQueue:
             del self._tasks[task_id]
         if to_remove:
             self._notify_change()
-            self._save()
+            self._save(*to_remove)
         return len(to_remove)
 
     def retry_all_failed(self) -> int:
         """重试所有可重试的失败任务"""
-        count = 0
-        for task in self.retryable():
+        retried = self.retryable()
+        for task in retried:
             task.reset_for_retry()
-            count += 1
-        if count:
+        if retried:
             self._notify_change()
-            self._save()
-        return count
+            self._save(*(t.id for t in retried))
+        return len(retried)
 
     def on_change(self, callback: Callable[[], None]) -> None:
         """注册变更回调"""
         self._on_change_callbacks.append(callback)
+        self._compiled_notify = _compile_notify(tuple(self._on_change_callbacks))
 
     def _notify_change(self) -> None:
         """通知变更"""
-        for callback in self._on_change_callbacks:
-            try:
-                callback()
-            except Exception as e:
-                logger.warning(f"任务变更回调失败: {e}")
+        self._compiled_notify()
 
-    def _save(self) -> None:
-        """保存到文件"""
+    def _save(self, *task_ids: str) -> None:
+        """记录发生变更的任务，并在 _SAVE_DELAY 秒后合并写盘"""
         if not self._persist_path:
             return
 
+        with self._save_lock:
+            for task_id in task_ids:
+                task = self._tasks.get(task_id)
+                if task is None:
+                    self._task_json.pop(task_id, None)
+                    line = _dumps_line({"op": "remove", "id": task_id})
+                else:
+                    task_json = _dumps_line(task.to_dict())
+                    self._task_json[task_id] = task_json
+                    line = b'{"op":"upsert","task":' + task_json + b"}"
+                # 同一任务在窗口内多次变更只保留最后一行
+                self._pending_lines.pop(task_id, None)
+                self._pending_lines[task_id] = line
+            if self._flush_timer is None:
+                timer = threading.Timer(_SAVE_DELAY, self.flush)
+                timer.daemon = True
+                self._flush_timer = timer
+                timer.start()
+
+    def flush(self) -> None:
+        """立即写入未保存的变更（进程退出时会自动调用）"""
+        with self._save_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._pending_lines:
+                return
+            lines, self._pending_lines = self._pending_lines, {}
+            self._append_log(list(lines.values()))
+            self._maybe_compact()
+
+    def _append_log(self, lines: list[bytes]) -> None:
+        """将已序列化的变更追加到 JSONL 日志，每个任务一行"""
+        if not self._log_path:
+            return
+
         try:
+            self._log_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self._log_path, "ab") as f:
+                f.write(b"\n".join(lines) + b"\n")
+        except Exception as e:
+            logger.error(f"写入任务日志失败: {e}")
+
+    def _maybe_compact(self) -> None:
+        """日志相对快照过大时重写快照"""
+        if not self._persist_path or not self._log_path:
+            return
+
+        try:
+            log_size = self._log_path.stat().st_size
+        except OSError:
+            return
+        try:
+            snapshot_size = self._persist_path.stat().st_size
+        except OSError:
+            snapshot_size = 0
+
+        if log_size > max(snapshot_size * _COMPACT_RATIO, _COMPACT_MIN_BYTES):
+            self._save_now()
+
+    def _save_now(self) -> None:
+        """写入全量快照并清空增量日志"""
+        if not self._persist_path:
+            return
+
+        try:
+            # 可能在定时器线程中执行：只使用变更时留下的序列化结果，不读取任务对象
+            with self._save_lock:
+                task_json = list(self._task_json.values())
             data = {
                 "version": 1,
-                "tasks": [t.to_dict() for t in self._tasks.values()],
-                "updated_at": datetime.now().isoformat(),
+                "tasks": [_loads(b) for b in task_json],
+                "updated_at": int(time.time()),  # 仅供排查，不参与加载
             }
 
             # 确保目录存在
@@ -301,34 +469,63 @@ class TaskQueue:
 
             # 写入临时文件后重命名 (原子操作)
             tmp_path = self._persist_path.with_suffix(".tmp")
-            tmp_path.write_text(json.dumps(data, ensure_ascii=False, indent=2))
+            tmp_path.write_bytes(_dumps(data))
             tmp_path.replace(self._persist_path)
 
+            # 快照已包含全部变更；即使此处失败，重放旧日志也会得到相同状态
+            if self._log_path:
+                self._log_path.unlink(missing_ok=True)
+
         except Exception as e:
             logger.error(f"保存任务队列失败: {e}")
 
     def _load(self) -> None:
-        """从文件加载"""
-        if not self._persist_path or not self._persist_path.exists():
+        """从快照加载，再按顺序重放增量日志"""
+        if not self._persist_path:
             return
 
-        try:
-            data = json.loads(self._persist_path.read_text(encoding="utf-8"))
+        if self._persist_path.exists():
+            try:
+                data = _loads(self._persist_path.read_bytes())
+
+                for task_data in data.get("tasks", []):
+                    try:
+                        task = DownloadTask.from_dict(task_data)
+                        self._tasks[task.id] = task
+                    except Exception as e:
+                        logger.warning(f"恢复任务失败: {e}")
+
+            except Exception as e:
+                logger.error(f"加载任务队列失败: {e}")
 
-            for task_data in data.get("tasks", []):
+        if self._log_path and self._log_path.exists():
+            try:
+                raw = self._log_path.read_bytes()
+            except OSError as e:
+                logger.error(f"读取任务日志失败: {e}")
+                raw = b""
+            for line in raw.splitlines():
+                if not line.strip():
+                    continue
                 try:
-                    task = DownloadTask.from_dict(task_data)
-                    # 恢复时将下载中的任务标记为待处理
-                    if task.status == TaskStatus.DOWNLOADING.value:
-                        task.status = TaskStatus.PENDING.value
-                    self._tasks[task.id] = task
+                    op = _loads(line)
+                    if op["op"] == "remove":
+                        self._tasks.pop(op["id"], None)
+                    else:
+                        task = DownloadTask.from_dict(op["task"])
+                        self._tasks[task.id] = task
                 except Exception as e:
-                    logger.warning(f"恢复任务失败: {e}")
+                    # 末尾可能是写了一半的行
+                    logger.warning(f"跳过无效的任务日志行: {e}")
 
-            logger.info(f"已恢复 {len(self._tasks)} 个任务")
+        # 恢复时将下载中的任务标记为待处理
+        for task in self._tasks.values():
+            if task.status == TaskStatus.DOWNLOADING.value:
+                task.status = TaskStatus.PENDING.value
+            self._task_json[task.id] = _dumps_line(task.to_dict())
 
-        except Exception as e:
-            logger.error(f"加载任务队列失败: {e}")
+        if self._tasks:
+            logger.info(f"已恢复 {len(self._tasks)} 个任务")
 
     def __len__(self) -> int:
         return len(self._tasks)
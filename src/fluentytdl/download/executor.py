@@ -12,8 +12,9 @@ import os
 import re
 import shutil
 import subprocess
+import time
 from collections import deque
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
 from pathlib import Path
 from typing import Any, Protocol
 
@@ -26,7 +27,7 @@ from ..youtube.yt_dlp_cli import (
     resolve_yt_dlp_exe,
     ydl_opts_to_cli_args,
 )
-from .output_parser import YtDlpOutputParser
+from .output_parser import PROGRESS_PREFIX, DownloadProgress, YtDlpOutputParser, decode_line
 
 # 字幕/封面等附属文件后缀，不应被视为主输出文件
 _AUXILIARY_EXTENSIONS = frozenset(
@@ -59,6 +60,46 @@ def _is_auxiliary_file(path: str) -> bool:
 _MIN_VALID_MEDIA_BYTES = 10 * 1024
 
 
+# ── yt-dlp 固定参数 ──────────────────────────────────────
+
+# 结构化进度模板（由 output_parser 按 FLUENTYTDL| 前缀解析）
+_DOWNLOAD_TEMPLATE = (
+    "download:"
+    + PROGRESS_PREFIX
+    + "download|%(progress.downloaded_bytes)s|%(progress.total_bytes)s|%(progress.total_bytes_estimate)s"
+    + "|%(progress.speed)s|%(progress.eta)s"
+    + "|%(info.vcodec)s|%(info.acodec)s|%(info.ext)s|%(progress.filename)s"
+)
+_POSTPROCESS_TEMPLATE = (
+    "postprocess:" + PROGRESS_PREFIX + "postprocess|%(progress.status)s|%(progress.postprocessor)s"
+)
+
+# 让 yt-dlp 以 FLUENTYTDL| 结构化行输出进度；纯提取通道（字幕/封面）同样使用
+PROGRESS_TEMPLATE_ARGS = (
+    "--progress-template",
+    _DOWNLOAD_TEMPLATE,
+    "--progress-template",
+    _POSTPROCESS_TEMPLATE,
+)
+
+# 每次下载都相同的命令行前缀（可执行文件路径之后）
+_BASE_CMD_ARGS = (
+    "--ignore-config",
+    "--no-warnings",
+    "--no-color",
+    "--newline",
+    "--progress",
+    *PROGRESS_TEMPLATE_ARGS,
+)
+
+
+# 进度回调节流：两次回调至少间隔 _PROGRESS_MIN_INTERVAL 秒且百分比变化达到
+# _PROGRESS_MIN_DELTA；进度停滞时每 _PROGRESS_HEARTBEAT 秒仍回调一次以刷新速度
+_PROGRESS_MIN_INTERVAL = 0.05
+_PROGRESS_MIN_DELTA = 0.1
+_PROGRESS_HEARTBEAT = 1.0
+
+
 # ── 回调协议 ──────────────────────────────────────────────
 
 
@@ -138,6 +179,10 @@ def _win_hide_kwargs() -> dict[str, Any]:
     return kw
 
 
+# 导入时构建一次；Popen 在 Windows 上会复制 STARTUPINFO，共享实例是安全的
+_WIN_HIDE_KWARGS: dict[str, Any] = _win_hide_kwargs()
+
+
 # ── 执行器 ────────────────────────────────────────────────
 
 
@@ -215,32 +260,7 @@ class DownloadExecutor:
 
         ydl_opts["skip_unavailable_fragments"] = True
 
-        progress_prefix = "FLUENTYTDL|"
-        cmd: list[str] = [
-            str(exe),
-            "--ignore-config",
-            "--no-warnings",
-            "--no-color",
-            "--newline",
-            "--progress",
-            "--progress-template",
-            (
-                "download:"
-                + progress_prefix
-                + "download|%(progress.downloaded_bytes)s|%(progress.total_bytes)s|%(progress.total_bytes_estimate)s"
-                + "|%(progress.speed)s|%(progress.eta)s"
-                + "|%(info.vcodec)s|%(info.acodec)s|%(info.ext)s|%(progress.filename)s"
-            ),
-            "--progress-template",
-            (
-                "postprocess:"
-                + progress_prefix
-                + "postprocess|%(progress.status)s|%(progress.postprocessor)s"
-            ),
-        ]
-
-        cmd += ydl_opts_to_cli_args(ydl_opts)
-        cmd.append(url)
+        cmd: list[str] = [str(exe), *_BASE_CMD_ARGS, *ydl_opts_to_cli_args(ydl_opts), url]
 
         logger.info("[Executor][Native] cmd={}", " ".join(cmd))
 
@@ -255,28 +275,48 @@ class DownloadExecutor:
             text=False,
             env=env,
             cwd=work_dir,
-            **_win_hide_kwargs(),
+            **_WIN_HIDE_KWARGS,
         )
 
         output_path: str | None = None
         dest_paths: set[str] = set()
-        tail: deque[str] = deque(maxlen=120)
+        tail: deque[bytes] = deque(maxlen=120)  # 原始行，仅在出错时解码
         expected_total_bytes: int = 0  # 累计预期文件大小，用于完整性校验
+        last_emit_ts = 0.0
+        last_emit_pct = -1.0
+        last_emit_file: str | None = None
+        cwd = os.getcwd()  # 相对路径的基准，整个循环只取一次
+        last_filename: str | None = None  # 最近一次登记过的原始路径
+        held: DownloadProgress | None = None  # 被节流压下、尚未回调的最新进度帧
 
         proc = self._proc
         assert proc is not None
         assert proc.stdout is not None
-        for raw in proc.stdout:
+        # 逐行调用的方法先绑定到局部变量，循环内不再重复属性查找
+        parse = self._ytdlp_parser.parse_line_bytes
+        tail_append = tail.append
+        dest_add = dest_paths.add
+        monotonic = time.monotonic
+        for raw in _iter_raw_lines(proc.stdout):
             if cancel_check():
                 self._terminate_proc()
                 raise RuntimeError("用户取消下载")
 
-            line = _decode_line(raw)
-            if not line:
+            raw = raw.rstrip(b"\r")
+            if not raw:
                 continue
-            tail.append(line)
+            tail_append(raw)
+
+            parsed = parse(raw)
 
-            parsed = self._ytdlp_parser.parse_line(line)
+            # 一段连续的进度帧结束：补发被节流压下的最后一帧，
+            # 避免总大小未知时界面停留在过时的字节数/速度上
+            if held is not None and parsed.type != "progress":
+                last_emit_ts = monotonic()
+                last_emit_pct = held.percent if held.percent is not None else -1.0
+                last_emit_file = held.filename
+                on_progress(_progress_payload(held, label))
+                held = None
 
             if parsed.type == "progress" and parsed.progress:
                 # 追踪预期总大小（累加各流的 total_bytes）
@@ -284,21 +324,32 @@ class DownloadExecutor:
                 if isinstance(tb, (int, float)) and tb > 0:
                     expected_total_bytes = max(expected_total_bytes, int(tb))
 
-                on_progress(
-                    {
-                        "status": parsed.progress.status,
-                        "downloaded_bytes": parsed.progress.downloaded_bytes,
-                        "total_bytes": parsed.progress.total_bytes,
-                        "speed": parsed.progress.speed,
-                        "eta": parsed.progress.eta,
-                        "filename": parsed.progress.filename,
-                        "info_dict": parsed.progress.info_dict,
-                        "label": label,
-                    }
-                )
-                if parsed.progress.filename:
-                    p = _abs(parsed.progress.filename)
-                    dest_paths.add(p)
+                # 节流：首帧、切换到新文件、达到 100% 时必定回调
+                pct = parsed.progress.percent
+                now = monotonic()
+                elapsed = now - last_emit_ts
+                if (
+                    parsed.progress.filename != last_emit_file
+                    or (pct is not None and pct >= 100.0)
+                    or elapsed >= _PROGRESS_HEARTBEAT
+                    or (
+                        elapsed >= _PROGRESS_MIN_INTERVAL
+                        and (pct is None or abs(pct - last_emit_pct) >= _PROGRESS_MIN_DELTA)
+                    )
+                ):
+                    last_emit_ts = now
+                    last_emit_pct = pct if pct is not None else -1.0
+                    last_emit_file = parsed.progress.filename
+                    held = None
+                    on_progress(_progress_payload(parsed.progress, label))
+                else:
+                    held = parsed.progress
+                # 模板每帧都带同一个文件名：与上一次相同时不再重复登记
+                filename = parsed.progress.filename
+                if filename and filename != last_filename:
+                    last_filename = filename
+                    p = _abs(filename, cwd)
+                    dest_add(p)
                     if on_file_created:
                         on_file_created(p)
                     if not output_path and not _is_auxiliary_file(p):
@@ -306,9 +357,10 @@ class DownloadExecutor:
                         on_path(p)
 
             elif parsed.type == "destination":
-                if parsed.path:
-                    p = _abs(parsed.path)
-                    dest_paths.add(p)
+                if parsed.path and parsed.path != last_filename:
+                    last_filename = parsed.path
+                    p = _abs(parsed.path, cwd)
+                    dest_add(p)
                     if on_file_created:
                         on_file_created(p)
                     if not output_path and not _is_auxiliary_file(p):
@@ -331,9 +383,10 @@ class DownloadExecutor:
 
             elif parsed.type == "merge":
                 if parsed.path:
-                    p = _abs(parsed.path)
-                    output_path = p
-                    on_path(p)
+                    p = _abs(parsed.path, cwd)
+                    if p != output_path:
+                        output_path = p
+                        on_path(p)
                 if parsed.message:
                     on_status(parsed.message)
 
@@ -341,16 +394,19 @@ class DownloadExecutor:
                 if parsed.message:
                     on_status(parsed.message)
                 if parsed.path:
-                    p = _abs(parsed.path)
-                    dest_paths.add(p)
+                    p = _abs(parsed.path, cwd)
+                    dest_add(p)
                     if on_file_created:
                         on_file_created(p)
 
+        if held is not None:
+            on_progress(_progress_payload(held, label))
+
         rc = proc.wait()
         self._proc = None
 
         if rc != 0:
-            last_lines = "\n".join(tail)
+            last_lines = "\n".join(decode_line(r) for r in tail)
 
             # ━━━ 关卡 1: 文件存在性 + 大小有效性检查 ━━━
             # 容错场景：Windows 下 yt-dlp 常因无法删除 .part-Frag 文件返回 exit code 1
@@ -359,7 +415,7 @@ class DownloadExecutor:
             valid_path_found = None
             actual_size = 0
 
-            if output_path and os.path.exists(output_path):
+            if output_path:
                 try:
                     actual_size = os.path.getsize(output_path)
                     if actual_size >= _MIN_VALID_MEDIA_BYTES:
@@ -371,7 +427,7 @@ class DownloadExecutor:
             # 兜底探测：如果日志没截出 output_path，但生成了物理产物
             if not is_valid:
                 for d_path in dest_paths:
-                    if os.path.exists(d_path) and not _is_auxiliary_file(d_path):
+                    if not _is_auxiliary_file(d_path):
                         try:
                             sz = os.path.getsize(d_path)
                             if sz >= _MIN_VALID_MEDIA_BYTES:
@@ -495,7 +551,7 @@ class DownloadExecutor:
 
         cmd.append(url)
 
-        logger.debug("[Executor] 提取 URL cmd={}", " ".join(cmd))
+        logger.opt(lazy=True).debug("[Executor] 提取 URL cmd={}", lambda: " ".join(cmd))
 
         env = prepare_yt_dlp_env()
         env["PYTHONIOENCODING"] = "utf-8"
@@ -508,7 +564,7 @@ class DownloadExecutor:
             encoding="utf-8",
             errors="replace",
             env=env,
-            **_win_hide_kwargs(),
+            **_WIN_HIDE_KWARGS,
         )
 
         stdout, stderr = proc.communicate()
@@ -690,22 +746,53 @@ def _find_ffmpeg() -> str | None:
 # ── 辅助函数 ──────────────────────────────────────────────
 
 
-def _decode_line(raw: bytes) -> str:
-    """健壮的行解码 (UTF-8 → GBK → replace)。"""
-    try:
-        line = raw.decode("utf-8")
-    except UnicodeDecodeError:
-        try:
-            line = raw.decode("gbk")
-        except UnicodeDecodeError:
-            line = raw.decode("utf-8", errors="replace")
-    return line.rstrip("\r\n")
+# 子进程输出每次读取的块大小
+_READ_CHUNK = 64 * 1024
+
+
+def _progress_payload(progress: DownloadProgress, label: str) -> dict[str, Any]:
+    """下载进度帧 -> on_progress 回调的字典。"""
+    return {
+        "status": progress.status,
+        "downloaded_bytes": progress.downloaded_bytes,
+        "total_bytes": progress.total_bytes,
+        "speed": progress.speed,
+        "eta": progress.eta,
+        "filename": progress.filename,
+        "info_dict": progress.info_dict,
+        "label": label,
+    }
 
 
-def _abs(path: str) -> str:
-    """安全的 abspath。"""
+def _iter_raw_lines(stream: Any) -> Iterator[bytes]:
+    """按块读取子进程输出并切分为行（不含 \\n）。
+
+    直接 os.read 管道，读到多少处理多少：一次系统调用可取出多行，
+    避免逐行迭代文件对象的开销。
+    """
+    fd = stream.fileno()
+    pending = b""
+    while True:
+        chunk = os.read(fd, _READ_CHUNK)
+        if not chunk:
+            break
+        if pending:
+            chunk = pending + chunk
+        *lines, pending = chunk.split(b"\n")
+        yield from lines
+    if pending:
+        yield pending
+
+
+def _abs(path: str, cwd: str | None = None) -> str:
+    """安全的 abspath。
+
+    cwd 由调用方预先取好时直接拼接，省去 os.path.abspath 每次调用 os.getcwd()。
+    """
     try:
-        return os.path.abspath(path)
+        if cwd is None:
+            return os.path.abspath(path)
+        return os.path.normpath(os.path.join(cwd, path))
     except Exception:
         return path
 
@@ -1,17 +1,21 @@
 from __future__ import annotations
 
+import threading
+
 from PySide6.QtCore import QMutex, QMutexLocker, QObject, QRunnable, QThreadPool, Signal, Slot
 
 from ..models.yt_dto import YtMediaDTO
 from ..utils.logger import logger
 from ..youtube.youtube_service import YoutubeServiceOptions
-from .workers import EntryDetailWorker
+from ..youtube.yt_dlp_cli import YtDlpCancelled
+from .workers import fetch_entry_detail
 
 
 class MetadataFetchRunnable(QRunnable):
     """
-    A lightweight QRunnable that wraps our existing EntryDetailWorker logic.
-    Used for fetching video details concurrently within a QThreadPool.
+    A lightweight QRunnable that runs the entry-detail extraction directly on a
+    QThreadPool thread. No per-entry QThread object is created, so the number of
+    threads stays bounded by the pool size regardless of playlist length.
     """
 
     def __init__(
@@ -24,32 +28,29 @@ class MetadataFetchRunnable(QRunnable):
     ):
         super().__init__()
         self.task_id = task_id
-
-        # Internally reuse the worker logic but hook it up to our shared signals
-        self.worker = EntryDetailWorker(
-            row=0,  # Dummy row since we use task_id based tracking now
-            url=url,
-            options=options,
-            vr_mode=vr_mode,
-        )
+        self.url = url
+        self.options = options
+        self.vr_mode = vr_mode
         self.signals = signals
-
-        self.worker.finished.connect(self._on_finished)
-        self.worker.error.connect(self._on_error)
-
-    def _on_finished(self, _, dto: YtMediaDTO) -> None:
-        self.signals.task_finished.emit(self.task_id, dto)
-
-    def _on_error(self, _, err_msg: str) -> None:
-        self.signals.task_error.emit(self.task_id, err_msg)
+        self._cancel_event = threading.Event()
 
     def cancel(self) -> None:
-        self.worker.cancel()
+        self._cancel_event.set()
 
     @Slot()
     def run(self) -> None:
         self.signals.task_started.emit(self.task_id)
-        self.worker.run()
+        try:
+            dto = fetch_entry_detail(
+                self.url, self.options, vr_mode=self.vr_mode, cancel_event=self._cancel_event
+            )
+        except YtDlpCancelled:
+            dto = None
+        except Exception as exc:
+            self.signals.task_error.emit(self.task_id, str(exc))
+            return
+        if dto is not None:
+            self.signals.task_finished.emit(self.task_id, dto)
 
 
 class AsyncExtractorSignals(QObject):
@@ -3,10 +3,16 @@ from __future__ import annotations
 import os
 import re
 import subprocess
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Container
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING, Any
 
 from ..core.config_manager import config_manager
 from ..core.hardware_manager import hardware_manager
+from ..processing import subtitle_processor
 from ..processing.thumbnail_embed import can_embed_thumbnail, get_unsupported_formats_warning
 from ..processing.thumbnail_embedder import thumbnail_embedder
 from ..utils.logger import logger
@@ -15,6 +21,83 @@ from ..utils.spatialmedia import metadata_utils
 if TYPE_CHECKING:
     from .workers import DownloadWorker
 
+# 后处理阶段用到的扩展名集合（模块级常量，避免每次调用重建）
+_VIDEO_EXT_TUPLE = (".mp4", ".mkv", ".webm", ".avi", ".mov", ".m4a", ".mp3", ".flac", ".opus")
+_THUMB_EXTS = frozenset({".jpg", ".jpeg", ".png", ".webp"})
+_THUMB_EXT_ORDER = (".jpg", ".jpeg", ".webp", ".png")
+_SUB_EXTS = frozenset({".srt", ".ass", ".vtt"})
+_MERGED_EXT_ORDER = (".mp4", ".mkv", ".webm", ".avi", ".mov")
+
+# yt-dlp 分片文件名 (xxx.f137.mp4)：后处理扫描对每个路径都要判断，预编译一次
+_SHARD_TAIL_RE = re.compile(r"\.[fF]\d+\.\w+$")
+_SHARD_BASE_RE = re.compile(r"^(.+)\.[fF]\d+\.(\w+)$")
+_SHARD_NOEXT_RE = re.compile(r"^(.+)\.[fF]\d+$")
+
+# 多文件封面嵌入的最大并发数（每个任务各启动一个 AtomicParsley/FFmpeg 进程）
+_EMBED_MAX_WORKERS = 4
+
+# VR 转码的硬件编码器参数；字典顺序即优先级，取第一个可用的
+_GPU_ENCODER_ARGS: dict[str, tuple[str, ...]] = {
+    "h264_nvenc": ("-c:v", "h264_nvenc", "-preset", "p4", "-cq", "20"),
+    "h264_qsv": ("-c:v", "h264_qsv", "-global_quality", "20"),
+    "h264_amf": ("-c:v", "h264_amf"),
+}
+_CPU_ENCODER_ARGS = ("-c:v", "libx264", "-preset", "veryfast", "-crf", "23")
+
+# 让 ffmpeg 以 key=value 块的形式把进度写到 stdout，并关闭逐帧的 stats 行
+_FFMPEG_PROGRESS_ARGS = ("-nostats", "-progress", "pipe:1")
+# stats 行中的 time=HH:MM:SS.xx（-progress 不可用时的回退）
+_FFMPEG_TIME_RE = re.compile(rb"time=(\d+):(\d+):(\d+(?:\.\d+)?)")
+# VR 转换进度上报的最小间隔（秒）
+_FFMPEG_STATUS_INTERVAL = 0.1
+# 单次读取上限：一次 read 取走管道中积压的全部进度块
+_FFMPEG_READ_CHUNK = 32 * 1024
+# 收到 progress=end 后等待 ffmpeg 退出的上限（秒），超时强制结束
+_FFMPEG_EXIT_TIMEOUT = 5.0
+
+
+def _ffmpeg_progress_seconds(block: bytes | bytearray) -> float | None:
+    """从 ffmpeg 输出片段中取最新的已处理时长（秒）。
+
+    优先读取 -progress 的 out_time_us=<微秒>；没有时回退到 stats 行的 time=HH:MM:SS.xx。
+    """
+    pos = block.rfind(b"out_time_us=")
+    if pos >= 0:
+        end = block.find(b"\n", pos)
+        value = block[pos + 12 : end if end >= 0 else None].strip()
+        if value.isdigit():
+            return int(value) / 1_000_000
+    pos = block.rfind(b"time=")
+    if pos >= 0 and (m := _FFMPEG_TIME_RE.match(block, pos)):
+        return int(m[1]) * 3600 + int(m[2]) * 60 + float(m[3])
+    return None
+
+
+# Windows 下隐藏 ffmpeg 控制台窗口；标志固定，导入时构造一次复用（其他平台为 None）
+_STARTUPINFO = None
+# VR 转码会占满 CPU，以较低优先级运行，避免界面与进度上报被挤占
+_FFMPEG_CREATIONFLAGS = 0
+_FFMPEG_NICE = 5  # POSIX: 启动后调低 nice 值
+if os.name == "nt":
+    _STARTUPINFO = subprocess.STARTUPINFO()  # type: ignore[attr-defined]
+    _STARTUPINFO.dwFlags |= subprocess.STARTF_USESHOWWINDOW  # type: ignore[attr-defined]
+    _STARTUPINFO.wShowWindow = 0
+    _FFMPEG_CREATIONFLAGS = subprocess.BELOW_NORMAL_PRIORITY_CLASS  # type: ignore[attr-defined]
+
+# ffmpeg -filters 输出中的 v360 滤镜（整词匹配，避免命中其他滤镜名的片段）
+_V360_FILTER_RE = re.compile(rb"\bv360\b")
+
+# 字幕嵌入时记录的合并后选项
+_SUB_LOG_KEYS = (
+    "embedsubtitles",
+    "writesubtitles",
+    "writeautomaticsub",
+    "subtitleslangs",
+    "convertsubtitles",
+    "merge_output_format",
+    "format",
+)
+
 
 class DownloadContext:
     """下载上下文，用于在 Feature 和 Worker 之间传递状态"""
@@ -23,6 +106,8 @@ class DownloadContext:
         self.worker = worker
         self.opts = opts
         self.url = worker.url
+        # 后处理可能在线程池中并发上报状态，CleanLogger 的状态更新需串行
+        self._emit_lock = threading.Lock()
 
     @property
     def output_path(self) -> str | None:
@@ -37,11 +122,12 @@ class DownloadContext:
         return self.worker.dest_paths
 
     def emit_status(self, msg: str):
-        if hasattr(self.worker, "_clean_logger"):
-            pct = getattr(self.worker, "progress_val", 99.0)
-            self.worker._clean_logger.force_update("processing", pct, msg)
-        else:
-            self.worker.status_msg.emit(msg)
+        with self._emit_lock:
+            if hasattr(self.worker, "_clean_logger"):
+                pct = getattr(self.worker, "progress_val", 99.0)
+                self.worker._clean_logger.force_update("processing", pct, msg)
+            else:
+                self.worker.status_msg.emit(msg)
 
     def emit_warning(self, msg: str):
         logger.warning(msg)
@@ -58,42 +144,53 @@ class DownloadContext:
             return None
 
         # 检查当前 output_path 是否是分片文件
-        match = re.search(r"^(.+)\.[fF]\d+\.(\w+)$", output_path)
+        match = _SHARD_BASE_RE.match(output_path)
         if not match:
             if os.path.exists(output_path):
                 return output_path
             return None
 
         base_name = match.group(1)
-        possible_extensions = [".mp4", ".mkv", ".webm", ".avi", ".mov"]
-        for ext in possible_extensions:
+        for ext in _MERGED_EXT_ORDER:
             merged_path = base_name + ext
             if os.path.exists(merged_path):
                 return merged_path
 
         # 检查 dest_paths
         for dest_path in self.dest_paths:
-            if not re.search(r"\.[fF]\d+\.\w+$", dest_path):
+            if not _SHARD_TAIL_RE.search(dest_path):
                 if os.path.exists(dest_path):
                     return dest_path
         return None
 
-    def find_thumbnail_file(self, video_path: str) -> str | None:
-        """查找视频文件对应的封面文件"""
+    def find_thumbnail_file(
+        self, video_path: str, dir_names: Container[str] | None = None
+    ) -> str | None:
+        """查找视频文件对应的封面文件
+
+        dir_names: 视频所在目录经 os.path.normcase 处理的文件名集合（已扫描过目录时传入），
+        此时按名称查找而不再逐个 stat 候选文件；normcase 保证 Windows 上与
+        os.path.exists 一样不区分大小写。
+        """
         base_path = os.path.splitext(video_path)[0]
-        exts = [".jpg", ".jpeg", ".webp", ".png"]
+        if dir_names is None:
+            exists = os.path.exists
+        else:
+
+            def exists(path: str) -> bool:
+                return os.path.normcase(os.path.basename(path)) in dir_names
 
-        for ext in exts:
+        for ext in _THUMB_EXT_ORDER:
             candidate = base_path + ext
-            if os.path.exists(candidate):
+            if exists(candidate):
                 return candidate
 
-        match = re.match(r"^(.+)\.[fF]\d+$", base_path)
+        match = _SHARD_NOEXT_RE.match(base_path)
         if match:
             clean_base = match.group(1)
-            for ext in exts:
+            for ext in _THUMB_EXT_ORDER:
                 candidate = clean_base + ext
-                if os.path.exists(candidate):
+                if exists(candidate):
                     return candidate
         return None
 
@@ -140,16 +237,15 @@ class MetadataFeature(DownloadFeature):
 class SubtitleFeature(DownloadFeature):
     def on_download_start(self, context: DownloadContext) -> None:
         opts = context.opts
-        if opts.get("embedsubtitles"):
-            fmt = (opts.get("merge_output_format") or "").lower()
-            if fmt == "webm":
-                opts["merge_output_format"] = "mkv"
-                logger.info("[SubEmbed] WebM → MKV")
-            elif not fmt:
-                opts["merge_output_format"] = "mkv"
-                logger.info("[SubEmbed] 未指定 → MKV")
-        else:
+        if not opts.get("embedsubtitles"):
             logger.warning("[SubEmbed] embedsubtitles=False")
+            return
+        # WebM 无法嵌入 SRT/ASS；未指定容器时同样回退到 MKV
+        fmt = (opts.get("merge_output_format") or "").lower()
+        if fmt in ("", "webm"):
+            opts["merge_output_format"] = "mkv"
+        # 合并为一条日志，替代逐项输出
+        logger.info("[SubEmbed] {}", {k: opts.get(k) for k in _SUB_LOG_KEYS})
 
     def on_post_process(self, context: DownloadContext) -> None:
         opts = context.opts
@@ -157,8 +253,6 @@ class SubtitleFeature(DownloadFeature):
         if not opts.get("writesubtitles") and not opts.get("writeautomaticsub"):
             return
 
-        from ..processing import subtitle_processor
-
         # 纠正 output_path：分片文件（如 .f136.mp4）在合并后已被删除，需要找到最终的合并文件
         final_output = context.find_final_merged_file()
         if final_output:
@@ -176,22 +270,29 @@ class SubtitleFeature(DownloadFeature):
 
                 # 若配置了内嵌字幕，由我们手动清理外部残留（因搭配元数据嵌入时 yt-dlp 可能会默认保留外置文件）
                 if opts.get("embedsubtitles"):
-                    cleaned_count = 0
-                    for sub_file in result.processed_files:
-                        try:
-                            if os.path.exists(sub_file):
-                                os.remove(sub_file)
-                                cleaned_count += 1
-                        except OSError as e:
-                            logger.warning("清理外置字幕残留失败: {} - {}", sub_file, e)
-
-                    if cleaned_count > 0:
-                        logger.info("已清理 {} 个内嵌后的外置字幕文件", cleaned_count)
+                    self._cleanup_subtitle_files(result.processed_files)
             else:
                 logger.warning("字幕后处理失败: {}", result.message)
         except Exception as e:
             logger.exception("字幕后处理异常: {}", e)
 
+    def _cleanup_subtitle_files(self, sub_files: list[str]) -> None:
+        """删除已内嵌的外置字幕文件（列表为空时直接返回，不触碰文件系统）"""
+        if not sub_files:
+            return
+        cleaned_count = 0
+        for sub_file in dict.fromkeys(sub_files):
+            try:
+                os.remove(sub_file)
+                cleaned_count += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning("清理外置字幕残留失败: {} - {}", sub_file, e)
+
+        if cleaned_count > 0:
+            logger.info("已清理 {} 个内嵌后的外置字幕文件", cleaned_count)
+
 
 class ThumbnailFeature(DownloadFeature):
     def on_post_process(self, context: DownloadContext) -> None:
@@ -208,18 +309,55 @@ class ThumbnailFeature(DownloadFeature):
         if not files:
             return
 
-        if not thumbnail_embedder.is_available():
+        # 在当前线程一次性解析各嵌入工具路径，工作线程只读取已缓存的结果
+        if not any(thumbnail_embedder.get_tool_status().values()):
             context.emit_thumbnail_warning("⚠️ 封面嵌入工具不可用")
             return
 
-        for v, t in files:
-            self._process_single_file(context, v, t)
-        self._cleanup_thumbnail_files(context)
-
-    def _process_single_file(self, context: DownloadContext, video_path: str, thumb_path: str):
-        ext = os.path.splitext(video_path)[1].lower().lstrip(".")
-        if not can_embed_thumbnail(ext):
-            w = get_unsupported_formats_warning(ext)
+        # 同一批文件扩展名大多相同：每种扩展名只查询一次支持情况
+        support: dict[str, tuple[bool, str | None]] = {}
+        try:
+            if len(files) == 1:
+                self._embed_guarded(context, *files[0], support)
+            else:
+                # 每个文件的嵌入都是独立的外部进程调用，多个文件时并发执行
+                with ThreadPoolExecutor(
+                    max_workers=min(_EMBED_MAX_WORKERS, len(files)),
+                    thread_name_prefix="thumb-embed",
+                ) as pool:
+                    for v, t in files:
+                        pool.submit(self._embed_guarded, context, v, t, support)
+        finally:
+            self._cleanup_thumbnail_files(context)
+
+    def _embed_guarded(
+        self,
+        context: DownloadContext,
+        video_path: str,
+        thumb_path: str,
+        support: dict[str, tuple[bool, str | None]],
+    ) -> None:
+        # 单个文件失败不影响同批其他文件
+        try:
+            self._process_single_file(context, video_path, thumb_path, support)
+        except Exception as e:
+            logger.exception("[封面嵌入] 处理 {} 时发生异常: {}", video_path, e)
+            context.emit_thumbnail_warning(f"封面嵌入失败: {os.path.basename(video_path)}")
+
+    def _process_single_file(
+        self,
+        context: DownloadContext,
+        video_path: str,
+        thumb_path: str,
+        support: dict[str, tuple[bool, str | None]],
+    ):
+        ext = video_path.rpartition(".")[2].lower()
+        cached = support.get(ext)
+        if cached is None:
+            ok = can_embed_thumbnail(ext)
+            cached = support[ext] = (ok, None if ok else get_unsupported_formats_warning(ext))
+        ok, w = cached
+        if not ok:
             if w:
                 context.emit_thumbnail_warning(w)
             return
@@ -243,14 +381,24 @@ class ThumbnailFeature(DownloadFeature):
             paths.add(context.output_path)
         paths.update(context.dest_paths)
 
+        # 按目录去重后每个目录只 scandir 一次，存在性与封面候选都按文件名集合判断
+        by_dir: dict[str, list[str]] = defaultdict(list)
         for p in paths:
-            if not os.path.exists(p):
-                continue
-            if re.search(r"\.[fF]\d+\.\w+$", p):
+            if not _SHARD_TAIL_RE.search(p):
+                by_dir[os.path.dirname(p)].append(p)
+
+        for d, dir_paths in by_dir.items():
+            try:
+                with os.scandir(d or ".") as it:
+                    names = {os.path.normcase(entry.name) for entry in it}
+            except OSError:
                 continue
-            t = context.find_thumbnail_file(p)
-            if t:
-                files.append((p, t))
+            for p in dir_paths:
+                if os.path.normcase(os.path.basename(p)) not in names:
+                    continue
+                t = context.find_thumbnail_file(p, names)
+                if t:
+                    files.append((p, t))
 
         if not files:  # Fallback scan
             output_dir = None
@@ -260,52 +408,64 @@ class ThumbnailFeature(DownloadFeature):
                 output_dir = os.path.dirname(next(iter(context.dest_paths)))
 
             if output_dir and os.path.exists(output_dir):
-                v_files, t_files = [], []
-                v_exts = {".mp4", ".mkv", ".webm", ".avi", ".mov", ".m4a", ".mp3", ".flac", ".opus"}
-                t_exts = {".jpg", ".jpeg", ".png", ".webp"}
-                for f in os.listdir(output_dir):
-                    fp = os.path.join(output_dir, f)
-                    if not os.path.isfile(fp):
-                        continue
-                    if re.search(r"\.[fF]\d+\.\w+$", f):
-                        continue
-                    ext = os.path.splitext(f)[1].lower()
-                    if ext in v_exts:
-                        v_files.append(fp)
-                    elif ext in t_exts:
-                        t_files.append(fp)
-
-                for v in v_files:
-                    vb = os.path.splitext(os.path.basename(v))[0]
-                    for t in t_files:
-                        if os.path.splitext(os.path.basename(t))[0] == vb:
-                            files.append((v, t))
-                            context.output_path = v
-                            break
+                # 单次 scandir：视频按出现顺序收集，封面按文件名主干建索引，O(V+T) 配对
+                videos: list[tuple[str, str]] = []
+                thumbs: dict[str, str] = {}
+                with os.scandir(output_dir) as it:
+                    for entry in it:
+                        if not entry.is_file():
+                            continue
+                        f = entry.name
+                        if _SHARD_TAIL_RE.search(f):
+                            continue
+                        low = f.lower()
+                        if low.endswith(_VIDEO_EXT_TUPLE):
+                            videos.append((f[: f.rfind(".")], entry.path))
+                        elif low.endswith(_THUMB_EXT_ORDER):
+                            thumbs.setdefault(f[: f.rfind(".")], entry.path)
+
+                files = [(v, t) for stem, v in videos if (t := thumbs.get(stem))]
+                if files:
+                    # 与逐个覆盖的旧行为一致：以最后一个配对的视频作为输出路径
+                    context.output_path = files[-1][0]
         return files
 
     def _cleanup_thumbnail_files(self, context: DownloadContext) -> None:
         if not context.opts.get("writethumbnail"):
             return
-        paths = set()
-        if context.output_path and os.path.exists(context.output_path):
-            paths.add(context.output_path)
-        for p in context.dest_paths:
-            if os.path.exists(p):
-                paths.add(p)
-        exts = [".webp", ".jpg", ".jpeg", ".png"]
-        for p in paths:
-            b = os.path.splitext(p)[0]
-            for e in exts:
-                t = b + e
-                if os.path.exists(t):
-                    try:
-                        os.remove(t)
-                    except Exception:
-                        pass
+        # 先按目录聚合文件名主干，同目录只需扫描一次，重复主干也只处理一次
+        stems_by_dir: dict[str, set[str]] = defaultdict(set)
+        for p in (context.output_path, *context.dest_paths):
+            if p:
+                d, b = os.path.split(p)
+                stems_by_dir[d].add(os.path.normcase(os.path.splitext(b)[0]))
+
+        for d, stems in stems_by_dir.items():
+            try:
+                with os.scandir(d or ".") as it:
+                    for entry in it:
+                        # rfind 切片代替 splitext：每个目录项只需一次查找，不构造元组；
+                        # normcase 使比较与文件系统一致（Windows 不区分大小写）
+                        name = os.path.normcase(entry.name)
+                        dot = name.rfind(".")
+                        if dot <= 0:
+                            continue
+                        if name[dot:] in _THUMB_EXTS and name[:dot] in stems and entry.is_file():
+                            try:
+                                os.remove(entry.path)
+                            except Exception:
+                                pass
+            except OSError:
+                continue
 
 
 class VRFeature(DownloadFeature):
+    # ffmpeg_location 目录 -> 其中的可执行文件路径；只缓存确认是目录的结果，
+    # 目录不存在时每次重新判断，之后安装到该目录的 ffmpeg 也能被找到
+    _resolved_ffmpeg: dict[str, str] = {}
+    # (ffmpeg 路径, mtime) -> 是否支持 v360；同一二进制的滤镜列表不会变化，只需探测一次
+    _v360_support: dict[tuple[str, float], bool] = {}
+
     def on_post_process(self, context: DownloadContext) -> None:
         if not context.opts.get("__fluentytdl_use_android_vr"):
             return
@@ -325,9 +485,7 @@ class VRFeature(DownloadFeature):
             logger.warning("[VR] 无法找到最终文件")
             return
 
-        ffmpeg_exe = opts.get("ffmpeg_location") or "ffmpeg"
-        if os.path.isdir(ffmpeg_exe):
-            ffmpeg_exe = os.path.join(ffmpeg_exe, "ffmpeg.exe")
+        ffmpeg_exe = self._resolve_ffmpeg(opts.get("ffmpeg_location") or "ffmpeg")
 
         needs_convert = (convert or auto_convert) and proj == "eac"
         if needs_convert:
@@ -344,8 +502,8 @@ class VRFeature(DownloadFeature):
 
         if needs_convert:
             context.emit_status("VR 投影转换 (EAC -> Equi)...")
-            ext = os.path.splitext(final_file)[1]
-            out_conv = os.path.splitext(final_file)[0] + "_equi" + ext
+            base, ext = os.path.splitext(final_file)
+            out_conv = base + "_equi" + ext
 
             cmd = self._build_cmd(ffmpeg_exe, final_file, out_conv)
             dur = 0.0
@@ -355,97 +513,165 @@ class VRFeature(DownloadFeature):
                 pass
 
             if self._run_ffmpeg(cmd, context, dur):
+                # os.replace 在 Windows/POSIX 上均可覆盖目标，且为原子操作
                 if not config_manager.get("vr_keep_source", True):
-                    os.remove(final_file)
-                    os.rename(out_conv, final_file)
+                    os.replace(out_conv, final_file)
                 else:
-                    bak = os.path.splitext(final_file)[0] + ".eac" + ext
-                    if os.path.exists(bak):
-                        os.remove(bak)
-                    os.rename(final_file, bak)
-                    os.rename(out_conv, final_file)
+                    bak = base + ".eac" + ext
+                    os.replace(final_file, bak)
+                    os.replace(out_conv, final_file)
                 proj = "equirectangular"
             else:
                 context.emit_warning("VR 转码失败")
-                if os.path.exists(out_conv):
+                try:
                     os.remove(out_conv)
+                except FileNotFoundError:
+                    pass
 
         self._inject_meta(context, final_file, proj, opts)
 
+    def _resolve_ffmpeg(self, location: str) -> str:
+        resolved = self._resolved_ffmpeg.get(location)
+        if resolved is not None:
+            return resolved
+        if not os.path.isdir(location):
+            return location
+        resolved = self._resolved_ffmpeg[location] = os.path.join(location, "ffmpeg.exe")
+        return resolved
+
     def _build_cmd(self, exe, inp, out):
-        cmd = [exe, "-y", "-i", inp, "-vf", "v360=eac:e"]
         hw = config_manager.get("vr_hw_accel_mode", "auto")
-        encs = hardware_manager.get_gpu_encoders()
         gpu = ""
-        if hw in ("gpu", "auto") and encs:
-            if "h264_nvenc" in encs:
-                gpu = "h264_nvenc"
-            elif "h264_qsv" in encs:
-                gpu = "h264_qsv"
-            elif "h264_amf" in encs:
-                gpu = "h264_amf"
+        if hw in ("gpu", "auto"):
+            encs = set(hardware_manager.get_gpu_encoders())
+            gpu = next((e for e in _GPU_ENCODER_ARGS if e in encs), "")
 
         if gpu:
-            cmd.extend(["-c:v", gpu])
-            if gpu == "h264_nvenc":
-                cmd.extend(["-preset", "p4", "-cq", "20"])
-            elif gpu == "h264_qsv":
-                cmd.extend(["-global_quality", "20"])
+            enc_args: tuple[str, ...] = _GPU_ENCODER_ARGS[gpu]
         else:
-            cmd.extend(["-c:v", "libx264", "-preset", "veryfast", "-crf", "23"])
+            enc_args = _CPU_ENCODER_ARGS
             th = hardware_manager.get_optimal_ffmpeg_threads(True)
             if config_manager.get("vr_cpu_priority", "low") == "low":
                 th = max(1, th - 1)
             if th > 0:
-                cmd.extend(["-threads", str(th)])
+                enc_args = (*enc_args, "-threads", str(th))
 
-        cmd.extend(["-c:a", "copy", out])
-        return cmd
+        head = [exe, "-y", *_FFMPEG_PROGRESS_ARGS, "-i", inp, "-vf", "v360=eac:e"]
+        return [*head, *enc_args, "-c:a", "copy", out]
 
     def _check_ffmpeg_v360(self, exe):
         try:
-            si = subprocess.STARTUPINFO()
-            si.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            si.wShowWindow = 0
-            res = subprocess.run(
+            mtime = os.path.getmtime(exe)
+        except OSError:
+            mtime = 0.0  # PATH 中的命令名等无法 stat 的情况
+        key = (exe, mtime)
+        cached = self._v360_support.get(key)
+        if cached is not None:
+            return cached
+        try:
+            # 逐行读取，命中即结束子进程，无需把整份滤镜列表读进内存；
+            # 滤镜名是 ASCII，直接按字节匹配，省去逐行解码
+            supported = False
+            with subprocess.Popen(
                 [exe, "-filters"],
                 stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                startupinfo=si,
-                encoding="utf-8",
-                errors="replace",
-                check=False,
-            )
-            return "v360" in res.stdout
+                stderr=subprocess.DEVNULL,
+                stdin=subprocess.DEVNULL,
+                startupinfo=_STARTUPINFO,
+                bufsize=64 * 1024,
+            ) as p:
+                assert p.stdout is not None
+                for line in p.stdout:
+                    if _V360_FILTER_RE.search(line):
+                        supported = True
+                        p.kill()
+                        break
         except Exception:
             return False
+        self._v360_support[key] = supported
+        return supported
 
     def _run_ffmpeg(self, cmd, ctx, dur):
         try:
-            si = subprocess.STARTUPINFO()
-            si.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            si.wShowWindow = 0
+            # 二进制模式读取：-progress 输出的 key=value 行是纯 ASCII，无需整块解码；
+            # 进度只走 stdout (pipe:1)，stderr 上的编码器日志直接丢弃，不进入解析循环
             p = subprocess.Popen(
                 cmd,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
+                stderr=subprocess.DEVNULL,
                 stdin=subprocess.DEVNULL,
-                startupinfo=si,
-                encoding="utf-8",
-                errors="replace",
+                startupinfo=_STARTUPINFO,
+                creationflags=_FFMPEG_CREATIONFLAGS,
+                bufsize=_FFMPEG_READ_CHUNK,
             )
-            while True:
-                if p.stdout is None:
-                    break
-                line = p.stdout.readline()
-                if not line and p.poll() is not None:
-                    break
-                if line and "time=" in line:
-                    t = line[line.find("time=") + 5 :].split(" ")[0]
-                    ctx.emit_status(f"VR 转换... ({t})")
-            return p.returncode == 0
+            if hasattr(os, "setpriority"):
+                # 用 setpriority 而非 preexec_fn：后者在多线程进程中 fork 不安全
+                try:
+                    os.setpriority(os.PRIO_PROCESS, p.pid, _FFMPEG_NICE)
+                except OSError:
+                    pass
+            # 登记到 worker：cancel() 会终止 _proc_ref，长时间的转码也能及时取消
+            ctx.worker._proc_ref = p
+            cancel_event = ctx.worker._cancel_event
+            pct_scale = 100.0 / dur if dur > 0 else 0.0  # 循环内百分比只需一次乘法
+            # 有无总时长在循环外一次选定文案函数，循环内不再分支
+            progress_text = self._progress_text_pct if pct_scale else self._progress_text
+            last_key: tuple[int, int] | None = None
+            last_ts = 0.0
+            if p.stdout is not None:
+                # 读缓冲与未完成行缓冲在整个转换期间复用，不再每块新建 bytes
+                read_buf = memoryview(bytearray(_FFMPEG_READ_CHUNK))
+                pending = bytearray()
+                while True:
+                    n = p.stdout.readinto1(read_buf)
+                    if not n:
+                        break
+                    if cancel_event.is_set():
+                        p.kill()
+                        p.wait()
+                        return False
+                    pending += read_buf[:n]
+                    cut = max(pending.rfind(b"\r"), pending.rfind(b"\n"))
+                    if cut < 0:
+                        continue
+                    complete = pending[:cut]
+                    del pending[: cut + 1]
+                    # 预筛：out_time_us= / time= 都含 b"time"；进度块可能被拆在两次读取之间，
+                    # 因此不能要求同一片段里带 progress= 结束行
+                    if b"time" in complete:
+                        sec = _ffmpeg_progress_seconds(complete)
+                        # 节流：显示内容（整秒 / 0.1%）未变化或距上次上报不足间隔时跳过
+                        now = time.monotonic()
+                        if sec is not None and now - last_ts >= _FFMPEG_STATUS_INTERVAL:
+                            key = (int(sec), int(sec * pct_scale * 10))
+                            if key != last_key:
+                                last_key, last_ts = key, now
+                                ctx.emit_status(progress_text(sec, pct_scale))
+                    # progress=end 表示转码已完成，不必等 ffmpeg 关闭管道
+                    if b"progress=end" in complete:
+                        break
+            try:
+                rc = p.wait(timeout=_FFMPEG_EXIT_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                p.kill()
+                rc = p.wait()
+            ok = rc == 0 and not cancel_event.is_set()
+            if ok and pct_scale:
+                ctx.emit_status("VR 转换... 100.0%")
+            return ok
         except Exception:
             return False
+        finally:
+            ctx.worker._proc_ref = None
+
+    @staticmethod
+    def _progress_text_pct(sec: float, pct_scale: float) -> str:
+        hms = time.strftime("%H:%M:%S", time.gmtime(sec))
+        return f"VR 转换... {min(sec * pct_scale, 100.0):.1f}% ({hms})"
+
+    @staticmethod
+    def _progress_text(sec: float, pct_scale: float) -> str:
+        return f"VR 转换... ({time.strftime('%H:%M:%S', time.gmtime(sec))})"
 
     def _inject_meta(self, ctx, f, proj, opts):
         if os.path.splitext(f)[1].lower() not in (".mp4", ".mov"):
@@ -468,10 +694,19 @@ class VRFeature(DownloadFeature):
         tmp = f + ".tmp.mp4"
         try:
             metadata_utils.inject_metadata(f, tmp, md, lambda x: None)
-            if os.path.exists(tmp):
-                os.remove(f)
-                os.rename(tmp, f)
-                ctx.emit_status("VR 元数据注入成功")
+            try:
+                os.replace(tmp, f)
+            except FileNotFoundError:
+                # inject_metadata 对无法处理的文件只打印提示、不生成临时文件：按未注入处理
+                logger.debug("[VR] 未生成元数据注入文件，跳过: {}", f)
+                return
         except Exception:
-            if os.path.exists(tmp):
+            logger.exception("[VR] 元数据注入异常")
+            try:
                 os.remove(tmp)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.debug("[VR] 清理临时注入文件失败: {} - {}", tmp, e)
+            return
+        ctx.emit_status("VR 元数据注入成功")
@@ -8,13 +8,15 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Callable
 from dataclasses import dataclass, field
-from typing import Any
+from functools import cache
+from typing import Any, AnyStr
 
 # ── 解析结果类型 ──────────────────────────────────────────
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DownloadProgress:
     """标准化的下载进度数据。"""
 
@@ -29,7 +31,7 @@ class DownloadProgress:
     info_dict: dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ParsedLine:
     """单行解析结果。"""
 
@@ -40,275 +42,396 @@ class ParsedLine:
     postprocessor: str | None = None  # 后处理器名
 
 
-# ── yt-dlp 输出解析器 ────────────────────────────────────
+# ── yt-dlp 输出解析 ──────────────────────────────────────
 
+# 结构化进度行前缀 (--progress-template)
+PROGRESS_PREFIX = "FLUENTYTDL|"
+_PROGRESS_PREFIX_B = PROGRESS_PREFIX.encode("ascii")
 
-class YtDlpOutputParser:
-    """解析 yt-dlp CLI 的 stdout 输出行。"""
+_WRITE_NOTICE = "Writing video "
 
-    # 结构化进度行前缀 (--progress-template)
-    PROGRESS_PREFIX = "FLUENTYTDL|"
+# yt-dlp 标准的目标路径行前缀（空白不规范时由 _re_dest 兜底）
+_DEST_PREFIX = "[download] Destination: "
+_DEST_PREFIX_B = _DEST_PREFIX.encode("ascii")
 
-    # [download] 95.0% of ~15.30MiB at 2.50MiB/s ETA 00:03
-    _RE_PROGRESS_FULL = re.compile(
-        r"^\[download\]\s+(?P<pct>\d+(?:\.\d+)?)%\s+of\s+~?(?P<total>[\d\.]+)"
-        r"(?P<tunit>[KMGTPE]i?B)\s+at\s+(?P<speed>[\d\.]+)(?P<sunit>[KMGTPE]i?B)/s"
-        r"\s+ETA\s+(?P<eta>\d{1,2}:\d{2}(?::\d{2})?)",
-        re.IGNORECASE,
-    )
+# 下面的正则只在对应分支第一次命中时才编译：结构化进度模式下大多用不到
 
-    # [download] 15.30MiB at 2.50MiB/s ETA 00:03  (total unknown)
-    _RE_PROGRESS_PARTIAL = re.compile(
-        r"^\[download\]\s+(?P<done>[\d\.]+)(?P<unit>[KMGTPE]i?B)\s+at\s+"
-        r"(?P<speed>[\d\.]+)(?P<sunit>[KMGTPE]i?B)/s\s+ETA\s+"
-        r"(?P<eta>\d{1,2}:\d{2}(?::\d{2})?)",
-        re.IGNORECASE,
-    )
+@cache
+def _re_dest() -> re.Pattern[str]:
+    # [download]   Destination: path/to/file.mp4  （空白不规范的兜底）
+    return re.compile(r"\[download\]\s+Destination:\s+(?P<path>.+)")
 
+
+@cache
+def _re_warning() -> re.Pattern[str]:
     # stderror warnings from yt-dlp
-    _RE_WARNING = re.compile(r"^WARNING:\s*(.*)", re.IGNORECASE)
+    return re.compile(r"WARNING:\s*(.*)", re.IGNORECASE)
 
-    # [download] Destination: path/to/file.mp4
-    _RE_DEST = re.compile(r"^\[download\]\s+Destination:\s+(?P<path>.+)$")
 
+@cache
+def _re_merge() -> re.Pattern[str]:
     # [Merger] Merging formats into "path/to/file.mp4"
-    _RE_MERGE = re.compile(r'^\[Merger\]\s+Merging formats into\s+"?(?P<path>[^"]+)"?$')
+    return re.compile(r'\[Merger\]\s+Merging formats into\s+"?(?P<path>[^"]+)"?')
+
 
+@cache
+def _re_extract_audio() -> re.Pattern[str]:
     # [ExtractAudio] Destination: path/to/file.mp3
-    _RE_EXTRACT_AUDIO = re.compile(r"^\[ExtractAudio\]\s+Destination:\s+(?P<path>.+)$")
+    return re.compile(r"\[ExtractAudio\]\s+Destination:\s+(?P<path>.+)")
 
-    _RE_FFMPEG_PROGRESS = re.compile(
+
+@cache
+def _re_ffmpeg_progress() -> re.Pattern[str]:
+    return re.compile(
         r"size=\s*[\d]+\w*\s+time=(?P<time>\d{2}:\d{2}:\d{2}\.\d{2})"
         r".*?speed=\s*(?P<speed>[\d.]+)x"
     )
 
-    # 后处理器名称映射
-    _PP_NAMES: dict[str, str] = {
-        "MoveFiles": "移动文件",
-        "Merger": "合并音视频",
-        "FFmpegMerger": "合并音视频",
-        "EmbedThumbnail": "嵌入封面",
-        "FFmpegMetadata": "嵌入元数据",
-        "FFmpegThumbnailsConvertor": "转换封面格式",
-        "FFmpegExtractAudio": "提取音频",
-        "FFmpegVideoConvertor": "转换视频格式",
-        "FFmpegEmbedSubtitle": "嵌入字幕",
-        "SponsorBlock": "跳过赞助片段",
-        "ModifyChapters": "修改章节",
-    }
 
-    def parse_line(self, line: str) -> ParsedLine:
-        """解析 yt-dlp 输出的一行。"""
-        if not line:
-            return ParsedLine(type="unknown")
-
-        # 0. Warning
-        wm = self._RE_WARNING.match(line)
-        if wm:
-            return ParsedLine(type="warning", message=wm.group(1).strip())
-
-        # 1. 结构化进度行 (FLUENTYTDL|...)
-        if line.startswith(self.PROGRESS_PREFIX):
-            return self._parse_structured_progress(line)
-
-        # 2. 字幕下载提示
-        if "Writing video subtitles to:" in line:
-            parts = line.split(":", 1)
-            path = parts[1].strip() if len(parts) > 1 else None
-            return ParsedLine(
-                type="subtitle",
-                path=path,
-                message=line,
+# 后处理器名称映射
+_PP_NAMES: dict[str, str] = {
+    "MoveFiles": "移动文件",
+    "Merger": "合并音视频",
+    "FFmpegMerger": "合并音视频",
+    "EmbedThumbnail": "嵌入封面",
+    "FFmpegMetadata": "嵌入元数据",
+    "FFmpegThumbnailsConvertor": "转换封面格式",
+    "FFmpegExtractAudio": "提取音频",
+    "FFmpegVideoConvertor": "转换视频格式",
+    "FFmpegEmbedSubtitle": "嵌入字幕",
+    "SponsorBlock": "跳过赞助片段",
+    "ModifyChapters": "修改章节",
+}
+
+_PP_STATUS_NAMES: dict[str, str] = {"started": "开始", "processing": "处理中", "finished": "完成"}
+
+
+# 空行/纯空白行共用的解析结果（ParsedLine 不可变，可安全共享）
+_UNKNOWN_EMPTY = ParsedLine(type="unknown")
+
+
+def parse_line(line: str) -> ParsedLine:
+    """解析 yt-dlp 输出的一行（无状态、不缓存）。"""
+    if not line or line.isspace():
+        return _UNKNOWN_EMPTY
+
+    # 1. 结构化进度行 (FLUENTYTDL|...)，下载期间绝大多数行走这里
+    if line.startswith(PROGRESS_PREFIX):
+        return _parse_structured_progress(line)
+
+    # 2. 按方括号标签分派 ([download] / [Merger] / [ExtractAudio] / ...)
+    if line[0] == "[":
+        tag, sep, _ = line.partition("]")
+        handler = _TAG_HANDLERS.get(tag + sep)
+        if handler is not None:
+            return handler(line)
+
+    # 3. Warning
+    if wm := _re_warning().match(line):
+        return ParsedLine(type="warning", message=wm.group(1).strip())
+
+    # 4. 字幕/封面写入提示（标签不在行首的兜底）
+    if (notice := _parse_write_notice(line)) is not None:
+        return notice
+
+    # 5. 字幕转换 / 合并（标签不在行首的兜底）
+    if "[FFmpegSubtitlesConvertor]" in line:
+        return _handle_status(line)
+    if "Merging formats" in line:
+        return _handle_merge(line)
+
+    # 6. ffmpeg 原生进度
+    if "time=" in line and (m := _re_ffmpeg_progress().search(line)):
+        time_str = m.group("time")
+        speed = m.group("speed") + "x"
+        time_sec = _parse_eta_hms(time_str[:8]) or 0.0
+        try:
+            ms = float("0." + time_str[-2:])
+            time_sec += ms
+        except ValueError:
+            pass
+        return ParsedLine(
+            type="ffmpeg_progress",
+            progress=DownloadProgress(
+                status="ffmpeg_progress",
+                speed=0,
+                eta=0,
+                info_dict={"time_sec": time_sec, "speed": speed}
             )
+        )
 
-        # 2.5 封面下载提示
-        if "Writing video thumbnail" in line and "to:" in line:
-            parts = line.split("to:", 1)
-            path = parts[1].strip() if len(parts) > 1 else None
-            return ParsedLine(
-                type="subtitle",  # 复用 subtitle 类型以复用 executor 中的路径跟踪逻辑
-                path=path,
-                message=line,
-            )
+    return ParsedLine(type="unknown", message=line)
 
-        # 3. 字幕转换
-        if "[FFmpegSubtitlesConvertor]" in line:
-            return ParsedLine(type="status", message=line)
-
-        # 4. 合并/提取音频
-        if (
-            line.startswith("[Merger]")
-            or line.startswith("[ExtractAudio]")
-            or "Merging formats" in line
-        ):
-            m = self._RE_MERGE.match(line)
-            if m:
-                return ParsedLine(type="merge", path=m.group("path").strip(), message=line)
-            m = self._RE_EXTRACT_AUDIO.match(line)
-            if m:
-                return ParsedLine(type="merge", path=m.group("path").strip(), message=line)
-            return ParsedLine(type="status", message=line)
-
-        # 5. 下载目标路径
-        m = self._RE_DEST.match(line)
-        if m:
-            return ParsedLine(type="destination", path=m.group("path").strip())
-
-        m = self._RE_FFMPEG_PROGRESS.search(line)
-        if m:
-            time_str = m.group("time")
-            speed = m.group("speed") + "x"
-            time_sec = _parse_eta_hms(time_str[:8]) or 0.0
-            try:
-                ms = float("0." + time_str[-2:])
-                time_sec += ms
-            except ValueError:
-                pass
-            return ParsedLine(
-                type="ffmpeg_progress",
-                progress=DownloadProgress(
-                    status="ffmpeg_progress",
-                    speed=0,
-                    eta=0,
-                    info_dict={"time_sec": time_sec, "speed": speed}
-                )
-            )
 
-        # 6. [download] 百分比进度
-        if line.startswith("[download]"):
-            return self._parse_download_line(line)
-
-        return ParsedLine(type="unknown", message=line)
-
-    def _parse_structured_progress(self, line: str) -> ParsedLine:
-        """解析 FLUENTYTDL|download|... 或 FLUENTYTDL|postprocess|... 格式。"""
-        parts = line.split("|")
-
-        if len(parts) >= 11 and parts[1] == "download":
-            downloaded_s = parts[2]
-            total_s = parts[3]
-            estimate_s = parts[4]
-            speed_s = parts[5]
-            eta_s = parts[6]
-            vcodec = parts[7]
-            acodec = parts[8]
-            # ext = parts[9] # unused
-            filename = parts[10]
-
-            downloaded = _safe_int(downloaded_s)
-            total = _safe_int(total_s)
-            estimate = _safe_int(estimate_s)
-            effective_total = total if total > 0 else estimate
-            speed = _safe_int(speed_s)
-            eta = _parse_eta_value(eta_s)
-            percent = (downloaded / effective_total * 100.0) if effective_total > 0 else None
-
-            return ParsedLine(
-                type="progress",
-                progress=DownloadProgress(
-                    status="downloading",
-                    downloaded_bytes=downloaded,
-                    total_bytes=effective_total or None,
-                    total_bytes_is_estimate=(total <= 0 and estimate > 0),
-                    speed=speed or None,
-                    eta=eta,
-                    percent=percent,
-                    filename=filename if filename and filename != "NA" else None,
-                    info_dict={"vcodec": vcodec, "acodec": acodec},
-                ),
-            )
+def _parse_write_notice(line: str) -> ParsedLine | None:
+    """字幕/封面写入提示行；不是时返回 None。
 
-        if len(parts) >= 3 and parts[1] == "postprocess":
-            status = parts[2] if len(parts) > 2 else ""
-            pp = parts[3] if len(parts) > 3 else ""
-            pp_display = self._PP_NAMES.get(pp, pp) if pp else "处理"
-            status_names = {"started": "开始", "processing": "处理中", "finished": "完成"}
-            status_display = status_names.get(status, status) if status else ""
-            if pp_display and status_display:
-                msg = f"后处理: {pp_display} ({status_display})"
-            elif pp_display:
-                msg = f"后处理: {pp_display}..."
-            else:
-                msg = "后处理中..."
-            return ParsedLine(type="postprocess", postprocessor=pp, message=msg)
-
-        return ParsedLine(type="unknown", message=line)
-
-    def _parse_download_line(self, line: str) -> ParsedLine:
-        """解析 [download] 百分比进度行。"""
-        m = self._RE_PROGRESS_FULL.match(line)
-        if m:
-            pct = float(m.group("pct"))
-            total = _size_to_bytes(m.group("total"), m.group("tunit"))
-            speed = _size_to_bytes(m.group("speed"), m.group("sunit"))
-            eta = _parse_eta_hms(m.group("eta"))
-            downloaded = int(total * pct / 100.0) if total > 0 else 0
-            return ParsedLine(
-                type="progress",
-                progress=DownloadProgress(
-                    status="downloading",
-                    downloaded_bytes=downloaded,
-                    total_bytes=total or None,
-                    speed=speed or None,
-                    eta=eta,
-                    percent=pct,
-                ),
-            )
+    两种提示共享 "Writing video " 前缀：只扫描一次，再在命中位置比较后缀。
+    """
+    i = line.find(_WRITE_NOTICE)
+    if i < 0:
+        return None
+    i += len(_WRITE_NOTICE)
+
+    # 字幕下载提示
+    if line.startswith("subtitles to:", i):
+        path = line[i + len("subtitles to:") :].strip()
+    # 封面下载提示（复用 subtitle 类型以复用 executor 中的路径跟踪逻辑）
+    elif line.startswith("thumbnail", i) and (j := line.find("to:", i)) >= 0:
+        path = line[j + 3 :].strip()
+    else:
+        return None
+    return ParsedLine(type="subtitle", path=path or None, message=line)
+
+
+def _handle_info(line: str) -> ParsedLine:
+    """[info] 行：除字幕/封面写入提示外都是无关信息，不再走后续的正则兜底。"""
+    notice = _parse_write_notice(line)
+    return notice if notice is not None else ParsedLine(type="unknown", message=line)
+
+
+def _handle_status(line: str) -> ParsedLine:
+    return ParsedLine(type="status", message=line)
+
+
+def _handle_merge(line: str) -> ParsedLine:
+    """[Merger] / [ExtractAudio] 行：提取最终输出路径。"""
+    if (m := _re_merge().fullmatch(line)) or (m := _re_extract_audio().fullmatch(line)):
+        return ParsedLine(type="merge", path=m.group("path").strip(), message=line)
+    return ParsedLine(type="status", message=line)
+
+
+def _handle_download(line: str) -> ParsedLine:
+    """[download] 行：目标路径；其余均视为状态消息。
+
+    下载进度由 --progress-template 输出的 FLUENTYTDL| 结构化行提供，
+    人类可读的 "[download]  45.2% of ..." 进度行不再解析。
+    """
+    if line.startswith(_DEST_PREFIX):
+        return ParsedLine(type="destination", path=line[len(_DEST_PREFIX) :].strip())
+    if m := _re_dest().fullmatch(line):
+        return ParsedLine(type="destination", path=m.group("path").strip())
+    return ParsedLine(type="status", message=line)
+
+
+# 方括号标签 -> 处理函数；绝大多数行只需一次 partition + 一次哈希查找
+_TAG_HANDLERS: dict[str, Callable[[str], ParsedLine]] = {
+    "[download]": _handle_download,
+    "[info]": _handle_info,
+    "[Merger]": _handle_merge,
+    "[ExtractAudio]": _handle_merge,
+    "[FFmpegSubtitlesConvertor]": _handle_status,
+}
+
+
+def _pipe_offsets(line: AnyStr, limit: int, sep: AnyStr) -> list[int]:
+    """返回 line 中前 limit 个分隔符 sep 的位置。"""
+    idx: list[int] = []
+    pos = line.find(sep)
+    while pos >= 0 and len(idx) < limit:
+        idx.append(pos)
+        pos = line.find(sep, pos + 1)
+    return idx
+
+
+def _download_progress(
+    downloaded: int,
+    total: int,
+    estimate: int,
+    speed: int,
+    eta: int | None,
+    vcodec: str,
+    acodec: str,
+    filename: str,
+) -> ParsedLine:
+    """由结构化下载进度的各字段构造解析结果。"""
+    effective_total = total if total > 0 else estimate
+    percent = (downloaded / effective_total * 100.0) if effective_total > 0 else None
+    return ParsedLine(
+        type="progress",
+        progress=DownloadProgress(
+            status="downloading",
+            downloaded_bytes=downloaded,
+            total_bytes=effective_total or None,
+            total_bytes_is_estimate=(total <= 0 and estimate > 0),
+            speed=speed or None,
+            eta=eta,
+            percent=percent,
+            filename=filename if filename and filename != "NA" else None,
+            info_dict={"vcodec": vcodec, "acodec": acodec},
+        ),
+    )
 
-        m2 = self._RE_PROGRESS_PARTIAL.match(line)
-        if m2:
-            downloaded = _size_to_bytes(m2.group("done"), m2.group("unit"))
-            speed = _size_to_bytes(m2.group("speed"), m2.group("sunit"))
-            eta = _parse_eta_hms(m2.group("eta"))
-            return ParsedLine(
-                type="progress",
-                progress=DownloadProgress(
-                    status="downloading",
-                    downloaded_bytes=downloaded,
-                    speed=speed or None,
-                    eta=eta,
-                ),
-            )
 
-        return ParsedLine(type="status", message=line)
+def _parse_structured_progress_bytes(raw: bytes) -> ParsedLine:
+    """FLUENTYTDL|download|... 的字节版本。
+
+    数值字段直接从 bytes 解析（int()/float() 均接受 bytes），
+    只有编码、文件名这些文本字段才解码；其它结构化行转交字符串版本。
+    """
+    idx = _pipe_offsets(raw, 11, b"|")
+    n = len(idx)
+    if n < 10 or not raw.startswith(b"download|", idx[0] + 1):
+        return _parse_structured_progress(decode_line(raw))
+
+    eta_b = raw[idx[5] + 1 : idx[6]]
+    return _download_progress(
+        _safe_int_b(raw[idx[1] + 1 : idx[2]]),
+        _safe_int_b(raw[idx[2] + 1 : idx[3]]),
+        _safe_int_b(raw[idx[3] + 1 : idx[4]]),
+        _safe_int_b(raw[idx[4] + 1 : idx[5]]),
+        int(eta_b) if eta_b.isdigit() else _parse_eta_value(eta_b.decode("ascii", "replace")),
+        raw[idx[6] + 1 : idx[7]].decode("ascii", "replace"),
+        raw[idx[7] + 1 : idx[8]].decode("ascii", "replace"),
+        decode_line(raw[idx[9] + 1 : idx[10] if n > 10 else None]),
+    )
+
+
+def _parse_structured_progress(line: str) -> ParsedLine:
+    """解析 FLUENTYTDL|download|... 或 FLUENTYTDL|postprocess|... 格式。
+
+    只记录分隔符位置，按需切出用到的字段，不为每个字段都分配子串。
+    第 k 个字段为 line[idx[k - 1] + 1 : idx[k]]（最后一个字段延伸到行尾）。
+    """
+    idx = _pipe_offsets(line, 11, "|")
+    n = len(idx)
+
+    if n >= 10 and line.startswith("download|", idx[0] + 1):
+        # 字段 9 (ext) 未使用
+        return _download_progress(
+            _safe_int(line[idx[1] + 1 : idx[2]]),
+            _safe_int(line[idx[2] + 1 : idx[3]]),
+            _safe_int(line[idx[3] + 1 : idx[4]]),
+            _safe_int(line[idx[4] + 1 : idx[5]]),
+            _parse_eta_value(line[idx[5] + 1 : idx[6]]),
+            line[idx[6] + 1 : idx[7]],
+            line[idx[7] + 1 : idx[8]],
+            line[idx[9] + 1 : idx[10] if n > 10 else None],
+        )
+
+    if n >= 2 and line.startswith("postprocess|", idx[0] + 1):
+        status = line[idx[1] + 1 : idx[2] if n > 2 else None]
+        pp = line[idx[2] + 1 : idx[3] if n > 3 else None] if n > 2 else ""
+        pp_display = _PP_NAMES.get(pp, pp) if pp else "处理"
+        status_display = _PP_STATUS_NAMES.get(status, status) if status else ""
+        if pp_display and status_display:
+            msg = f"后处理: {pp_display} ({status_display})"
+        elif pp_display:
+            msg = f"后处理: {pp_display}..."
+        else:
+            msg = "后处理中..."
+        return ParsedLine(type="postprocess", postprocessor=pp, message=msg)
+
+    return ParsedLine(type="unknown", message=line)
+
+
+class YtDlpOutputParser:
+    """解析 yt-dlp CLI 的 stdout 输出行。
+
+    解析本身由模块级 parse_line 完成；本类只额外维护一份按原文的结果缓存。
+    """
+
+    PROGRESS_PREFIX = PROGRESS_PREFIX
+
+    # 非结构化行的解析缓存上限（下载停滞/限速时 yt-dlp 会反复输出相同的行）
+    _CACHE_MAX = 128
+
+    def __init__(self) -> None:
+        # 键为 str（parse_line）或原始 bytes（parse_line_bytes），两者不会冲突
+        self._cache: dict[str | bytes, ParsedLine] = {}
+
+    def parse_line(self, line: str) -> ParsedLine:
+        """解析 yt-dlp 输出的一行。
+
+        结构化进度行每帧字节数都不同，直接解析；其余行按原文缓存，
+        命中时返回同一个（不可变的）ParsedLine。
+        """
+        if line.startswith(PROGRESS_PREFIX):
+            return _parse_structured_progress(line)
+
+        parsed = self._cache.get(line)
+        if parsed is None:
+            parsed = self._remember(line, parse_line(line))
+        return parsed
+
+    def parse_line_bytes(self, raw: bytes) -> ParsedLine:
+        """解析子进程输出的原始字节行（可带行尾换行符）。
+
+        缓存按原始字节查找，命中时无需解码；结构化进度行与标准目标路径行
+        直接在字节上切分，只解码需要的字段。
+        """
+        raw = raw.rstrip(b"\r\n")
+        if raw.startswith(_PROGRESS_PREFIX_B):
+            return _parse_structured_progress_bytes(raw)
+        # 目标路径行每个文件只出现一次，不进缓存；只解码前缀之后的路径部分
+        if raw.startswith(_DEST_PREFIX_B):
+            path = decode_line(raw[len(_DEST_PREFIX_B) :]).strip()
+            return ParsedLine(type="destination", path=path)
+
+        parsed = self._cache.get(raw)
+        if parsed is None:
+            parsed = self._remember(raw, parse_line(decode_line(raw)))
+        return parsed
+
+    def _remember(self, key: str | bytes, parsed: ParsedLine) -> ParsedLine:
+        cache = self._cache
+        if len(cache) >= self._CACHE_MAX:
+            del cache[next(iter(cache))]
+        cache[key] = parsed
+        return parsed
 
 
 # ── 工具函数 ──────────────────────────────────────────────
 
 
+def decode_line(raw: bytes) -> str:
+    """健壮的行解码 (UTF-8 → GBK → replace)。"""
+    try:
+        line = raw.decode("utf-8")
+    except UnicodeDecodeError:
+        try:
+            line = raw.decode("gbk")
+        except UnicodeDecodeError:
+            line = raw.decode("utf-8", errors="replace")
+    return line.rstrip("\r\n")
+
+
 def _safe_int(s: str) -> int:
     """安全地将字符串转为 int，NA 或空值返回 0。"""
     if not s or s == "NA":
         return 0
     try:
-        return int(float(s))
+        # 字节数通常是纯整数，直接 int() 免去中间 float 对象；速度等小数再走 float
+        return int(s) if s.isdigit() else int(float(s))
     except (ValueError, TypeError):
         return 0
 
 
-def _size_to_bytes(value: str, unit: str) -> int:
-    """将 '15.3' + 'MiB' 转为字节数。"""
+def _safe_int_b(s: bytes) -> int:
+    """_safe_int 的字节版本（int()/float() 可直接解析 ASCII 字节串）。"""
+    if not s or s == b"NA":
+        return 0
     try:
-        n = float(value)
-    except (ValueError, TypeError):
+        return int(s) if s.isdigit() else int(float(s))
+    except ValueError:
         return 0
 
-    u = unit.upper().rstrip("B").rstrip("I")
-    multipliers = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
-    return int(n * multipliers.get(u, 1))
-
 
 def _parse_eta_hms(eta: str) -> int | None:
     """解析 HH:MM:SS 或 MM:SS 格式的 ETA 为秒。"""
     if not eta:
         return None
+    # 按冒号位置切片，避免每个进度行都 split 出一个列表
     try:
-        parts = eta.split(":")
-        if len(parts) == 3:
-            return int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
-        if len(parts) == 2:
-            return int(parts[0]) * 60 + int(parts[1])
-        return int(parts[0])
+        c1 = eta.find(":")
+        if c1 < 0:
+            return int(eta)
+        c2 = eta.find(":", c1 + 1)
+        if c2 < 0:
+            return int(eta[:c1]) * 60 + int(eta[c1 + 1 :])
+        if eta.find(":", c2 + 1) < 0:
+            return int(eta[:c1]) * 3600 + int(eta[c1 + 1 : c2]) * 60 + int(eta[c2 + 1 :])
+        return int(eta[:c1])
     except (ValueError, TypeError):
         return None
 
@@ -321,6 +444,6 @@ def _parse_eta_value(s: str) -> int | None:
     if ":" in s:
         return _parse_eta_hms(s)
     try:
-        return int(float(s))
+        return int(s) if s.isdigit() else int(float(s))
     except (ValueError, TypeError):
         return None
@@ -14,7 +14,7 @@ from ..utils.logger import logger
 from ..utils.translator import translate_error
 from ..youtube.youtube_service import YoutubeServiceOptions, youtube_service
 from ..youtube.yt_dlp_cli import YtDlpCancelled, run_dump_single_json
-from .executor import DownloadExecutor
+from .executor import PROGRESS_TEMPLATE_ARGS, DownloadExecutor
 from .features import (
     DownloadContext,
     MetadataFeature,
@@ -24,6 +24,12 @@ from .features import (
     VRFeature,
 )
 
+# yt-dlp 子进程 stdout 的读缓冲：逐行迭代时每次 read() 取 64 KiB，而不是默认的 8 KiB
+_PIPE_BUFSIZE = 64 * 1024
+
+# 任务启动时写入调试日志的选项
+_DEBUG_OPT_KEYS = ("postprocessors", "addmetadata", "writethumbnail")
+
 
 class DownloadCancelled(Exception):
     pass
@@ -212,6 +218,29 @@ class VRInfoExtractWorker(QThread):
             self.error.emit(translate_error(exc))
 
 
+def fetch_entry_detail(
+    url: str,
+    options: YoutubeServiceOptions | None,
+    *,
+    vr_mode: bool,
+    cancel_event: threading.Event,
+) -> YtMediaDTO | None:
+    """同步深解析单个条目；已取消时返回 None。
+
+    供 EntryDetailWorker 与线程池任务共用，池内任务直接调用，无需为每个条目创建 QThread。
+    """
+    if vr_mode:
+        # VR 模式：使用 android_vr 客户端获取详情
+        info = youtube_service.extract_vr_info_sync(url, cancel_event=cancel_event)
+    else:
+        # 普通模式：使用标准流程
+        info = youtube_service.extract_video_info(url, options, cancel_event=cancel_event)
+
+    if cancel_event.is_set():
+        return None
+    return YtMediaDTO.from_dict(info)
+
+
 class EntryDetailWorker(QThread):
     """播放列表条目深解析：获取 formats / 最高质量等信息"""
 
@@ -238,21 +267,11 @@ class EntryDetailWorker(QThread):
 
     def run(self) -> None:
         try:
-            if self.vr_mode:
-                # VR 模式：使用 android_vr 客户端获取详情
-                info = youtube_service.extract_vr_info_sync(
-                    self.url, cancel_event=self._cancel_event
-                )
-            else:
-                # 普通模式：使用标准流程
-                info = youtube_service.extract_video_info(
-                    self.url, self.options, cancel_event=self._cancel_event
-                )
-
-            if self._cancel_event.is_set():
+            dto = fetch_entry_detail(
+                self.url, self.options, vr_mode=self.vr_mode, cancel_event=self._cancel_event
+            )
+            if dto is None:
                 return
-
-            dto = YtMediaDTO.from_dict(info)
             self.finished.emit(self.row, dto)
         except YtDlpCancelled:
             return
@@ -286,6 +305,7 @@ class DownloadWorker(QThread):
         self.executor: DownloadExecutor | None = None
         # Best-effort output location for UI “open folder” action.
         self.output_path: str | None = None
+        self._emitted_output_path: str | None = None  # 最近一次通过信号发出的路径
         self.download_dir: str | None = None
         # Best-effort: all destination paths seen in yt-dlp output.
         # This is important for paused/cancelled tasks where final output_path may be unknown.
@@ -326,6 +346,13 @@ class DownloadWorker(QThread):
 
         self._clean_logger = CleanLogger(self._on_clean_update, duration=self.v_duration)
 
+    def _emit_output_path(self, path: str) -> None:
+        """发出 output_path_ready；与上次发出的路径相同时跳过（避免重复的跨线程信号）。"""
+        if path == self._emitted_output_path:
+            return
+        self._emitted_output_path = path
+        self.output_path_ready.emit(path)
+
     def _on_clean_update(self, state: str, pct: float, msg: str) -> None:
         self._final_state = state
         self.progress_val = pct
@@ -436,7 +463,7 @@ class DownloadWorker(QThread):
 
         # 非沙盒模式（纯提取任务等）兜底清理
         for f in sweep_list:
-            if os.path.exists(f) and os.path.isfile(f):
+            if os.path.isfile(f):
                 try:
                     os.remove(f)
                     logger.info("已物理清除残骸: {}", f)
@@ -449,15 +476,18 @@ class DownloadWorker(QThread):
         """清理 sandbox 内的 .part/.ytdl 残骸，避免 403 后断点续传撞过期 token。"""
         if not hasattr(self, "sandbox_dir") or not self.sandbox_dir:
             return
-        if not os.path.exists(self.sandbox_dir):
+        try:
+            it = os.scandir(self.sandbox_dir)
+        except OSError:
             return
-        for f in os.listdir(self.sandbox_dir):
-            if f.endswith((".part", ".ytdl")):
-                try:
-                    os.remove(os.path.join(self.sandbox_dir, f))
-                    logger.info("已清理残骸文件: {}", f)
-                except OSError:
-                    pass
+        with it:
+            for entry in it:
+                if entry.name.endswith((".part", ".ytdl")):
+                    try:
+                        os.remove(entry.path)
+                        logger.info("已清理残骸文件: {}", entry.name)
+                    except OSError:
+                        pass
 
     def _wait_if_paused(self) -> None:
         """红绿灯检查点：如果红灯则阻塞，直到绿灯或取消。"""
@@ -489,23 +519,29 @@ class DownloadWorker(QThread):
                 return
 
             # 合并 YoutubeService 的基础反封锁/网络配置
+            # 复制时直接跳过内部元选项（__fluentytdl_*，不能传给 yt-dlp）
             base_opts = youtube_service.build_ydl_options()
             import copy
-            merged = copy.deepcopy(base_opts)
-            merged.update(copy.deepcopy(self.opts))
+            merged = copy.deepcopy(
+                {
+                    **base_opts,
+                    **{
+                        k: v
+                        for k, v in self.opts.items()
+                        if not (isinstance(k, str) and k.startswith("__fluentytdl_"))
+                    },
+                }
+            )
 
             # 保存原始格式选择（用于错误恢复）
             self._original_format = merged.get("format")
             if self._original_format:
                 logger.info("原始格式选择已保存: {}", self._original_format)
 
-            # DEBUG: 记录音频处理相关选项
-            logger.debug(
-                "DownloadWorker options - postprocessors: {}", merged.get("postprocessors")
-            )
-            logger.debug("DownloadWorker options - addmetadata: {}", merged.get("addmetadata"))
-            logger.debug(
-                "DownloadWorker options - writethumbnail: {}", merged.get("writethumbnail")
+            # DEBUG: 记录音频处理相关选项（合并为一条，且仅在 DEBUG 生效时才构建）
+            logger.opt(lazy=True).debug(
+                "DownloadWorker options: {}",
+                lambda: {k: merged.get(k) for k in _DEBUG_OPT_KEYS},
             )
 
             # Derive download directory from outtmpl (best effort).
@@ -545,15 +581,6 @@ class DownloadWorker(QThread):
                 feature.configure(merged)
                 feature.on_download_start(context)
 
-            # Capture intent flags before stripping
-            merged.get("__fluentytdl_use_android_vr", False)
-            merged.get("embedsubtitles", False)
-
-            # Strip internal meta options (never pass to yt-dlp)
-            for k in list(merged.keys()):
-                if isinstance(k, str) and k.startswith("__fluentytdl_"):
-                    merged.pop(k, None)
-
             # === Phase 2: 断点续传支持 ===
             if config_manager.get("enable_resume", True):
                 merged["continuedl"] = True  # 继续下载部分文件
@@ -607,7 +634,7 @@ class DownloadWorker(QThread):
                 if final_path:
                     self.output_path = final_path
                     if not hasattr(self, "sandbox_dir"):
-                        self.output_path_ready.emit(final_path)
+                        self._emit_output_path(final_path)
 
             except DownloadCancelled:
                 raise
@@ -638,37 +665,44 @@ class DownloadWorker(QThread):
                     
                     final_moved_path = None
                     try:
-                        for entry in os.scandir(self.sandbox_dir):
-                            if entry.is_file() and not entry.name.endswith(".part") and not entry.name.endswith(".ytdl"):
-                                src = entry.path
-                                dst = os.path.join(self.download_dir, entry.name)
-                                
-                                # Move the file
-                                if os.path.exists(dst):
-                                    os.remove(dst)
-                                shutil.move(src, dst)
-                                
-                                # Check if this is the main output path
-                                if self.output_path and os.path.basename(self.output_path) == entry.name:
-                                    final_moved_path = dst
-                                elif not self.output_path and not entry.name.endswith((".jpg", ".jpeg", ".png", ".webp", ".srt", ".vtt", ".ass", ".lrc")):
-                                    final_moved_path = dst
-                                
+                        # 先取完目录列表再移动，避免边遍历边修改目录
+                        with os.scandir(self.sandbox_dir) as it:
+                            entries = [
+                                e for e in it if e.is_file() and not e.name.endswith((".part", ".ytdl"))
+                            ]
+                        out_name = os.path.basename(self.output_path) if self.output_path else None
+                        for entry in entries:
+                            src = entry.path
+                            dst = os.path.join(self.download_dir, entry.name)
+                            
+                            # Move the file
+                            try:
+                                os.remove(dst)
+                            except FileNotFoundError:
+                                pass
+                            shutil.move(src, dst)
+                            
+                            # Check if this is the main output path
+                            if out_name is not None and out_name == entry.name:
+                                final_moved_path = dst
+                            elif not self.output_path and not entry.name.endswith((".jpg", ".jpeg", ".png", ".webp", ".srt", ".vtt", ".ass", ".lrc")):
+                                final_moved_path = dst
+                            
                         if final_moved_path:
                             self.output_path = final_moved_path
-                            self.output_path_ready.emit(final_moved_path)
+                            self._emit_output_path(final_moved_path)
                         elif self.output_path and not self.output_path.startswith(self.sandbox_dir):
-                            self.output_path_ready.emit(self.output_path)
+                            self._emit_output_path(self.output_path)
                             
                         # Clean up sandbox
                         shutil.rmtree(self.sandbox_dir, ignore_errors=True)
                     except Exception as e:
                         logger.warning("移动沙盒文件失败: {}", e)
                         if self.output_path:
-                             self.output_path_ready.emit(self.output_path)
+                             self._emit_output_path(self.output_path)
                 else:
                     if self.output_path:
-                        self.output_path_ready.emit(self.output_path)
+                        self._emit_output_path(self.output_path)
                 
                 self._clean_logger.force_update("completed", 100.0, "✅ 下载并处理完成！")
                 self.completed.emit()
@@ -728,8 +762,14 @@ class DownloadWorker(QThread):
             self.error.emit({"title": "错误", "message": "yt-dlp 可执行文件未找到"})
             return
 
-        # 构建最精简的 CLI 参数
-        cmd: list[str] = [str(exe), "--ignore-config", "--no-warnings", "--newline"]
+        # 构建最精简的 CLI 参数；字幕/封面的 HTTP 下载同样输出结构化进度行
+        cmd: list[str] = [
+            str(exe),
+            "--ignore-config",
+            "--no-warnings",
+            "--newline",
+            *PROGRESS_TEMPLATE_ARGS,
+        ]
 
         opts = self.opts
 
@@ -836,6 +876,7 @@ class DownloadWorker(QThread):
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
                 text=False,
+                bufsize=_PIPE_BUFSIZE,
                 env=env,
                 cwd=self.download_dir or os.getcwd(),
                 **extra_kw,
@@ -962,7 +1003,7 @@ class DownloadWorker(QThread):
             
             proc = subprocess.Popen(
                 cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
-                text=False, env=env, cwd=cwd, **extra_kw,
+                text=False, bufsize=_PIPE_BUFSIZE, env=env, cwd=cwd, **extra_kw,
             )
             self._proc_ref = proc
             assert proc.stdout is not None
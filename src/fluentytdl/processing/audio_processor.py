@@ -325,8 +325,8 @@ class AudioProcessor:
             # 如果没有指定输出路径，替换原文件
             if not output_path:
                 try:
-                    input_p.unlink()
-                    output_p.rename(input_p)
+                    # replace 原子覆盖目标，不会出现原文件已删而新文件未就位的窗口
+                    output_p.replace(input_p)
                 except Exception as e:
                     logger.error(f"替换原文件失败: {e}")
                     return False
@@ -434,8 +434,7 @@ class AudioProcessor:
 
             # 替换原文件
             try:
-                audio_p.unlink()
-                output_p.rename(audio_p)
+                output_p.replace(audio_p)
             except Exception as e:
                 logger.error(f"替换原文件失败: {e}")
                 return False
@@ -18,6 +18,9 @@ from typing import Any
 
 from ..utils.logger import logger
 
+# 需要检查/合并的字幕扩展名（小写）
+_SUBTITLE_EXTS = frozenset({".srt", ".ass", ".vtt"})
+
 
 @dataclass
 class SubtitleProcessResult:
@@ -105,16 +108,20 @@ class SubtitleProcessor:
         支持格式: .srt, .ass, .vtt
         命名模式: video.zh-Hans.srt, video.en.srt 等
         """
-        subtitle_extensions = [".srt", ".ass", ".vtt"]
-        parent_dir = video_path.parent
-        stem = video_path.stem
-
-        subtitle_files = []
-
         # 查找模式: {stem}.{lang}.{ext}
-        for file in parent_dir.glob(f"{stem}.*"):
-            if file.suffix.lower() in subtitle_extensions:
-                subtitle_files.append(file)
+        # 用前缀比较代替 glob：视频标题里的 [] 等字符会被 glob 当作通配符
+        stem_prefix = video_path.stem + "."
+        subtitle_files = []
+        try:
+            with os.scandir(video_path.parent) as it:
+                for entry in it:
+                    name = entry.name
+                    if not name.startswith(stem_prefix):
+                        continue
+                    if name[name.rfind(".") :].lower() in _SUBTITLE_EXTS and entry.is_file():
+                        subtitle_files.append(Path(entry.path))
+        except OSError:
+            return []
 
         return subtitle_files
 
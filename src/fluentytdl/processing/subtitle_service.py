@@ -51,12 +51,6 @@ def build_embed_opts(config: SubtitleConfig) -> dict[str, Any]:
     """
     from ..utils.logger import logger as _logger
 
-    _logger.info(
-        "[SubEmbed] build_embed_opts: embed_type={}, embed_mode={}",
-        config.embed_type,
-        config.embed_mode,
-    )
-
     opts: dict[str, Any] = {}
 
     if config.embed_type == "soft":
@@ -81,7 +75,12 @@ def build_embed_opts(config: SubtitleConfig) -> dict[str, Any]:
     if out_fmt:
         opts["convertsubtitles"] = out_fmt
 
-    _logger.info("[SubEmbed] build_embed_opts 返回: {}", opts)
+    _logger.info(
+        "[SubEmbed] build_embed_opts: embed_type={}, embed_mode={} -> {}",
+        config.embed_type,
+        config.embed_mode,
+        opts,
+    )
     return opts
 
 
@@ -168,6 +168,19 @@ ERROR_RULES = [
 ]
 
 
+# 规则正则只编译一次；合并后的总正则用于一次扫描判断是否有任何规则命中，
+# 未命中（常见的未知错误）时不再逐条扫描。命中后仍按 ERROR_RULES 顺序取第一条，保持优先级。
+_COMPILED_RULES = [
+    (re.compile(rule["value"], re.IGNORECASE), rule)
+    for rule in ERROR_RULES
+    if rule.get("condition") == "regex"
+]
+_ANY_RULE_RE = re.compile(
+    "|".join(f"(?:{pattern.pattern})" for pattern, _ in _COMPILED_RULES), re.IGNORECASE
+)
+_ERROR_LINE_RE = re.compile(r"ERROR:\s*(.*?)(?:\n|$)", re.IGNORECASE)
+
+
 def diagnose_error(exit_code: int, stderr: str, parsed_json: dict[str, Any] | None = None) -> DiagnosedError:
     """
     核心诊断函数：根据退出码、错误输出和 JSON 结构，生成诊断对象。
@@ -192,9 +205,9 @@ def diagnose_error(exit_code: int, stderr: str, parsed_json: dict[str, Any] | No
             )
 
     # 2. 启发式文本/正则层级判断
-    for rule in ERROR_RULES:
-        if rule.get("condition") == "regex":
-            if re.search(rule["value"], clean_msg, re.IGNORECASE):
+    if _ANY_RULE_RE.search(clean_msg):
+        for pattern, rule in _COMPILED_RULES:
+            if pattern.search(clean_msg):
                 return DiagnosedError(
                     code=rule["error_code"],
                     severity=rule["severity"],  # type: ignore
@@ -207,7 +220,7 @@ def diagnose_error(exit_code: int, stderr: str, parsed_json: dict[str, Any] | No
 
     # 3. 兜底解析
     fallback = stderr.strip()
-    match = re.search(r"ERROR:\s*(.*?)(?:\n|$)", stderr, flags=re.IGNORECASE)
+    match = _ERROR_LINE_RE.search(stderr)
     if match:
         fallback = match.group(1).strip()
     
@@ -0,0 +1,74 @@
+"""Unit tests for download.executor (native yt-dlp pipeline progress forwarding)."""
+
+import os
+import stat
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import pytest
+
+from fluentytdl.download import executor  # pyright: ignore[reportMissingImports]
+from fluentytdl.download.executor import DownloadExecutor  # pyright: ignore[reportMissingImports]
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="假 yt-dlp 使用 POSIX 脚本")
+
+
+def _frame(downloaded: int) -> str:
+    # 总大小未知（NA）：百分比为 None，节流只靠心跳与文件切换放行
+    return f"FLUENTYTDL|download|{downloaded}|NA|NA|1000|NA|avc1|NA|mp4|/tmp/out/v.mp4"
+
+
+def _run_fake_ytdlp(tmp_path, monkeypatch, lines, delay=0.02):
+    script = tmp_path / "yt-dlp"
+    if delay:
+        # 每行之间稍作停顿，让各帧分批读到
+        body = "\n".join(f"print({line!r}, flush=True); time.sleep({delay})" for line in lines)
+    else:
+        # 一次 write 写出全部行，读取端在同一块中收到
+        data = "".join(line + "\n" for line in lines).encode()
+        body = f"os.write(1, {data!r})"
+    script.write_text(f"#!{sys.executable}\nimport os, time\n{body}\n", encoding="utf-8")
+    script.chmod(script.stat().st_mode | stat.S_IXUSR)
+    monkeypatch.setattr(executor, "resolve_yt_dlp_exe", lambda: script)
+    monkeypatch.setattr(executor, "prepare_yt_dlp_env", lambda: dict(os.environ))
+
+    events = []
+    DownloadExecutor()._execute_native(
+        "https://example.com/v",
+        {"paths": {"home": str(tmp_path)}},
+        on_progress=lambda d: events.append(("progress", d["downloaded_bytes"])),
+        on_status=lambda m: events.append(("status", m)),
+        on_path=lambda p: None,
+        cancel_check=lambda: False,
+        on_file_created=lambda p: events.append(("file", p)),
+    )
+    return events
+
+
+class TestProgressThrottle:
+    def test_held_frame_flushed_before_status_line(self, tmp_path, monkeypatch):
+        lines = [_frame(n) for n in range(100, 2100, 100)] + ["[download] 100% of 2.00KiB"]
+        events = _run_fake_ytdlp(tmp_path, monkeypatch, lines)
+        progress = [e for e in events if e[0] == "progress"]
+        # 节流后回调次数少于帧数，但状态行之前必定收到最后一帧
+        assert len(progress) < 20
+        assert events[-2] == ("progress", 2000)
+        assert events[-1] == ("status", "[download] 100% of 2.00KiB")
+
+    def test_held_frame_flushed_at_end_of_stream(self, tmp_path, monkeypatch):
+        lines = [_frame(n) for n in range(100, 2100, 100)]
+        events = _run_fake_ytdlp(tmp_path, monkeypatch, lines)
+        assert events[-1] == ("progress", 2000)
+
+    def test_frames_in_one_read_keep_files_and_completion(self, tmp_path, monkeypatch):
+        lines = [
+            "FLUENTYTDL|download|500|1000|NA|1000|1|avc1|NA|mp4|/tmp/out/v.f137.mp4",
+            "FLUENTYTDL|download|1000|1000|NA|1000|0|avc1|NA|mp4|/tmp/out/v.f137.mp4",
+            "FLUENTYTDL|download|10|100|NA|1000|1|NA|mp4a|m4a|/tmp/out/v.f140.m4a",
+        ]
+        events = _run_fake_ytdlp(tmp_path, monkeypatch, lines, delay=0)
+        assert ("file", "/tmp/out/v.f137.mp4") in events
+        assert ("file", "/tmp/out/v.f140.m4a") in events
+        # 第一个文件的 100% 帧不会被下一文件的帧覆盖掉
+        assert ("progress", 1000) in events
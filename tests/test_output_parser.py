@@ -0,0 +1,269 @@
+"""Unit tests for download.output_parser (yt-dlp stdout line parsing)."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from fluentytdl.download.executor import (  # pyright: ignore[reportMissingImports]
+    PROGRESS_TEMPLATE_ARGS,
+)
+from fluentytdl.download.output_parser import (  # pyright: ignore[reportMissingImports]
+    YtDlpOutputParser,
+    _parse_eta_hms,
+    parse_line,
+)
+
+MIB = 1024 * 1024
+
+
+def _parse(line: str):
+    return YtDlpOutputParser().parse_line(line)
+
+
+class TestStructuredProgress:
+    def test_download_template(self):
+        parsed = _parse(
+            "FLUENTYTDL|download|5242880|10485760|NA|1048576|5|avc1|mp4a|mp4|/tmp/v.f137.mp4"
+        )
+        assert parsed.type == "progress"
+        p = parsed.progress
+        assert p is not None
+        assert p.downloaded_bytes == 5 * MIB
+        assert p.total_bytes == 10 * MIB
+        assert p.total_bytes_is_estimate is False
+        assert p.speed == MIB
+        assert p.eta == 5
+        assert p.percent == 50.0
+        assert p.filename == "/tmp/v.f137.mp4"
+        assert p.info_dict == {"vcodec": "avc1", "acodec": "mp4a"}
+
+    def test_download_template_estimate_and_na(self):
+        parsed = _parse("FLUENTYTDL|download|100|NA|400.0|NA|NA|none|opus|webm|NA")
+        p = parsed.progress
+        assert p is not None
+        assert p.total_bytes == 400
+        assert p.total_bytes_is_estimate is True
+        assert p.speed is None
+        assert p.eta is None
+        assert p.percent == 25.0
+        assert p.filename is None
+
+    def test_filename_cut_at_pipe(self):
+        # 模板以 | 分隔，文件名在第一个 | 处被截断
+        parsed = _parse("FLUENTYTDL|download|1|2|NA|NA|NA|a|b|mp4|/tmp/a|b.mp4")
+        assert parsed.progress is not None
+        assert parsed.progress.filename == "/tmp/a"
+
+    def test_postprocess_template(self):
+        parsed = _parse("FLUENTYTDL|postprocess|started|FFmpegMerger")
+        assert parsed.type == "postprocess"
+        assert parsed.postprocessor == "FFmpegMerger"
+        assert parsed.message == "后处理: 合并音视频 (开始)"
+
+    def test_fractional_and_integer_numbers(self):
+        parsed = _parse("FLUENTYTDL|download|2048|4096|NA|1536.75|12.0|a|b|mp4|NA")
+        p = parsed.progress
+        assert p is not None
+        assert p.downloaded_bytes == 2048
+        assert p.speed == 1536
+        assert p.eta == 12
+
+    def test_malformed_structured_line(self):
+        parsed = _parse("FLUENTYTDL|download|1|2")
+        assert parsed.type == "unknown"
+
+
+class TestLegacyDownloadLines:
+    def test_human_progress_is_status(self):
+        # 进度只来自结构化模板行，人类可读的进度行按状态处理
+        line = "[download]  50.0% of ~10.00MiB at  2.00MiB/s ETA 01:05"
+        parsed = _parse(line)
+        assert parsed.type == "status"
+        assert parsed.progress is None
+        assert parsed.message == line
+
+    def test_unknown_speed_is_status(self):
+        parsed = _parse("[download]   0.0% of 10.00MiB at  Unknown B/s ETA Unknown")
+        assert parsed.type == "status"
+
+    def test_destination(self):
+        parsed = _parse("[download] Destination: /tmp/out/v.f137.mp4")
+        assert parsed.type == "destination"
+        assert parsed.path == "/tmp/out/v.f137.mp4"
+
+    def test_destination_irregular_spacing(self):
+        parsed = _parse("[download]   Destination:  /tmp/out/v.mp4")
+        assert parsed.type == "destination"
+        assert parsed.path == "/tmp/out/v.mp4"
+
+    def test_other_download_line_is_status(self):
+        parsed = _parse("[download] 100% of 10.00MiB in 00:00:05")
+        assert parsed.type == "status"
+
+
+class TestOtherLines:
+    def test_empty(self):
+        assert _parse("").type == "unknown"
+
+    def test_blank_lines_share_one_result(self):
+        assert parse_line("") is parse_line("   \t")
+        assert parse_line("").message is None
+
+    def test_warning(self):
+        parsed = _parse("WARNING: [youtube] falling back")
+        assert parsed.type == "warning"
+        assert parsed.message == "[youtube] falling back"
+
+    def test_merge(self):
+        parsed = _parse('[Merger] Merging formats into "/tmp/out/v.mkv"')
+        assert parsed.type == "merge"
+        assert parsed.path == "/tmp/out/v.mkv"
+
+    def test_extract_audio(self):
+        parsed = _parse("[ExtractAudio] Destination: /tmp/out/v.mp3")
+        assert parsed.type == "merge"
+        assert parsed.path == "/tmp/out/v.mp3"
+
+    def test_extract_audio_other_is_status(self):
+        parsed = _parse("[ExtractAudio] Not converting audio")
+        assert parsed.type == "status"
+
+    def test_subtitle_write(self):
+        parsed = _parse("[info] Writing video subtitles to: /tmp/out/v.en.vtt")
+        assert parsed.type == "subtitle"
+        assert parsed.path == "/tmp/out/v.en.vtt"
+
+    def test_thumbnail_write(self):
+        parsed = _parse("[info] Writing video thumbnail 41 to: /tmp/out/v.webp")
+        assert parsed.type == "subtitle"
+        assert parsed.path == "/tmp/out/v.webp"
+
+    def test_subtitle_convertor(self):
+        line = "[FFmpegSubtitlesConvertor] Converting subtitles"
+        parsed = _parse(line)
+        assert parsed.type == "status"
+        assert parsed.message == line
+
+    def test_ffmpeg_progress(self):
+        parsed = _parse(
+            "frame=  10 fps=0.0 q=-1.0 size=    256kB time=00:01:02.50 bitrate=1 speed=2.5x"
+        )
+        assert parsed.type == "ffmpeg_progress"
+        assert parsed.progress is not None
+        assert parsed.progress.info_dict == {"time_sec": 62.5, "speed": "2.5x"}
+
+    def test_info_noise_is_unknown(self):
+        line = "[info] abc: Downloading 1 format(s): 137+140"
+        parsed = _parse(line)
+        assert parsed.type == "unknown"
+        assert parsed.message == line
+
+    def test_noise_is_unknown_with_message(self):
+        parsed = _parse("[youtube] abc: Downloading webpage")
+        assert parsed.type == "unknown"
+        assert parsed.message == "[youtube] abc: Downloading webpage"
+
+
+class TestLineCache:
+    def test_repeated_plain_line_is_shared(self):
+        parser = YtDlpOutputParser()
+        line = "[download] Destination: /tmp/out/v.mp4"
+        assert parser.parse_line(line) is parser.parse_line(line)
+
+    def test_structured_line_is_not_cached(self):
+        parser = YtDlpOutputParser()
+        line = "FLUENTYTDL|download|1|2|NA|NA|NA|a|b|mp4|/tmp/a.mp4"
+        parser.parse_line(line)
+        assert line not in parser._cache
+
+    def test_cache_is_bounded(self):
+        parser = YtDlpOutputParser()
+        for i in range(parser._CACHE_MAX + 10):
+            parser.parse_line(f"[youtube] id{i}: Downloading webpage")
+        assert len(parser._cache) == parser._CACHE_MAX
+        assert "[youtube] id0: Downloading webpage" not in parser._cache
+
+    def test_module_function_matches_parser(self):
+        line = '[Merger] Merging formats into "/tmp/out/v.mkv"'
+        assert parse_line(line) == YtDlpOutputParser().parse_line(line)
+
+    def test_bytes_path_matches_str_path(self):
+        parser = YtDlpOutputParser()
+        raw = '[Merger] Merging formats into "/tmp/视频.mkv"\r\n'.encode()
+        parsed = parser.parse_line_bytes(raw)
+        assert parsed.type == "merge"
+        assert parsed.path == "/tmp/视频.mkv"
+        assert parser.parse_line_bytes(raw) is parsed
+
+    def test_bytes_destination_matches_str_and_skips_cache(self):
+        parser = YtDlpOutputParser()
+        line = "[download] Destination: /tmp/视频.f137.mp4"
+        parsed = parser.parse_line_bytes(line.encode() + b"\n")
+        assert parsed == parse_line(line)
+        assert parser._cache == {}
+        gbk = parser.parse_line_bytes("[download] Destination: /tmp/视频.mp4".encode("gbk"))
+        assert gbk.path == "/tmp/视频.mp4"
+
+    def test_bytes_structured_matches_str(self):
+        line = "FLUENTYTDL|download|100|NA|400.0|2048.5|01:05|avc1|NA|mp4|/tmp/视频.mp4"
+        parser = YtDlpOutputParser()
+        assert parser.parse_line_bytes(line.encode()) == parser.parse_line(line)
+        pp = "FLUENTYTDL|postprocess|started|FFmpegMerger"
+        assert parser.parse_line_bytes(pp.encode()) == parser.parse_line(pp)
+
+    def test_bytes_structured_and_gbk(self):
+        parser = YtDlpOutputParser()
+        parsed = parser.parse_line_bytes(b"FLUENTYTDL|download|1|2|NA|NA|NA|a|b|mp4|/tmp/a.mp4\n")
+        assert parsed.progress is not None
+        assert parsed.progress.filename == "/tmp/a.mp4"
+        parsed = parser.parse_line_bytes("WARNING: 警告".encode("gbk"))
+        assert parsed.type == "warning"
+        assert parsed.message == "警告"
+
+
+class TestLightweightExtractLines:
+    """纯字幕/封面提取（--skip-download）与下载共用同一份 --progress-template。"""
+
+    @staticmethod
+    def _render(template: str, fields: dict) -> str:
+        # yt-dlp 的 %(a.b)s 占位符与 Python % 格式化语法一致
+        kind, _, body = template.partition(":")
+        assert kind == "download"
+        return body % fields
+
+    def test_subtitle_download_frame_is_progress(self):
+        args = PROGRESS_TEMPLATE_ARGS
+        template = args[args.index("--progress-template") + 1]
+        line = self._render(
+            template,
+            {
+                "progress.downloaded_bytes": 2048,
+                "progress.total_bytes": 4096,
+                "progress.total_bytes_estimate": "NA",
+                "progress.speed": 1024.5,
+                "progress.eta": 2,
+                "info.vcodec": "NA",
+                "info.acodec": "NA",
+                "info.ext": "vtt",
+                "progress.filename": "/tmp/out/v.en.vtt",
+            },
+        )
+        parsed = YtDlpOutputParser().parse_line(line)
+        assert parsed.type == "progress"
+        assert parsed.progress is not None
+        assert parsed.progress.percent == 50.0
+        assert parsed.progress.speed == 1024
+        assert parsed.progress.filename == "/tmp/out/v.en.vtt"
+
+
+class TestEtaHms:
+    def test_forms(self):
+        assert _parse_eta_hms("05") == 5
+        assert _parse_eta_hms("01:05") == 65
+        assert _parse_eta_hms("1:02:03") == 3723
+
+    def test_invalid(self):
+        assert _parse_eta_hms("") is None
+        assert _parse_eta_hms("12:") is None
+        assert _parse_eta_hms("Unknown") is None
@@ -0,0 +1,211 @@
+"""Unit tests for core.task_queue (task model and JSON persistence)."""
+
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+from fluentytdl.core.task_queue import (  # pyright: ignore[reportMissingImports]
+    DownloadTask,
+    TaskQueue,
+    TaskStatus,
+)
+
+
+class TestPersistence:
+    def test_roundtrip(self, tmp_path):
+        path = tmp_path / "tasks.json"
+        queue = TaskQueue(path)
+        task = queue.create("https://example.com/v", "/tmp/out", {"format": "best"}, title="视频")
+        task.mark_started()
+        queue.update(task)
+        queue.flush()
+
+        restored = TaskQueue(path)
+        got = restored.get(task.id)
+        assert got is not None
+        assert got.title == "视频"
+        assert got.options == {"format": "best"}
+        # 下载中的任务恢复为待处理
+        assert got.status == TaskStatus.PENDING.value
+
+    def test_file_is_utf8_json(self, tmp_path):
+        path = tmp_path / "tasks.json"
+        queue = TaskQueue(path)
+        queue.create("https://example.com/v", "/tmp/out", title="中文标题")
+        queue.flush()
+        assert "中文标题" in path.with_suffix(".jsonl").read_text(encoding="utf-8")
+
+    def test_remove_persists(self, tmp_path):
+        path = tmp_path / "tasks.json"
+        queue = TaskQueue(path)
+        task_id = queue.add(DownloadTask(url="u", output_dir="d"))
+        queue.flush()
+        assert queue.remove(task_id)
+        # 删除与其他变更一样合并写盘
+        assert len(TaskQueue(path)) == 1
+        queue.flush()
+        assert len(TaskQueue(path)) == 0
+
+    def test_saved_state_is_taken_at_change_time(self, tmp_path):
+        path = tmp_path / "tasks.json"
+        queue = TaskQueue(path)
+        task = queue.create("https://example.com/v", "/tmp/out", {"format": "best"})
+        # update() 之后、落盘之前对任务的修改不会被定时器线程写入
+        task.options["format"] = "worst"
+        queue.flush()
+        got = TaskQueue(path).get(task.id)
+        assert got is not None
+        assert got.options == {"format": "best"}
+
+    def test_saves_are_coalesced(self, tmp_path):
+        path = tmp_path / "tasks.json"
+        queue = TaskQueue(path)
+        for i in range(5):
+            queue.create(f"https://example.com/{i}", "/tmp/out")
+        # 变更只被标记，尚未落盘
+        assert not path.with_suffix(".jsonl").exists()
+        queue.flush()
+        assert len(TaskQueue(path)) == 5
+
+    def test_pending_changes_flushed_at_exit(self, tmp_path):
+        path = tmp_path / "tasks.json"
+        src = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+        script = (
+            "import sys; sys.path.insert(0, sys.argv[1]);"
+            "from pathlib import Path;"
+            "from fluentytdl.core.task_queue import TaskQueue;"
+            "q = TaskQueue(Path(sys.argv[2])); q.create('https://example.com/v', '/tmp/out')"
+        )
+        # 进程在合并窗口内退出，变更仍应落盘
+        subprocess.run([sys.executable, "-c", script, src, str(path)], check=True, timeout=60)
+        assert len(TaskQueue(path)) == 1
+
+    def test_updates_append_to_log(self, tmp_path):
+        path = tmp_path / "tasks.json"
+        queue = TaskQueue(path)
+        task = queue.create("https://example.com/v", "/tmp/out")
+        queue.flush()
+        task.mark_completed("/tmp/out/v.mp4")
+        queue.update(task)
+        queue.flush()
+
+        log_lines = path.with_suffix(".jsonl").read_bytes().splitlines()
+        assert len(log_lines) == 2
+        got = TaskQueue(path).get(task.id)
+        assert got is not None
+        assert got.status == TaskStatus.COMPLETED.value
+        assert got.output_path == "/tmp/out/v.mp4"
+
+    def test_torn_log_line_is_skipped(self, tmp_path):
+        path = tmp_path / "tasks.json"
+        queue = TaskQueue(path)
+        task = queue.create("https://example.com/v", "/tmp/out")
+        queue.flush()
+        with open(path.with_suffix(".jsonl"), "ab") as f:
+            f.write(b'{"op":"upsert","task":{"url"')
+        restored = TaskQueue(path)
+        assert restored.get(task.id) is not None
+        assert len(restored) == 1
+
+    def test_compaction_writes_snapshot(self, tmp_path):
+        path = tmp_path / "tasks.json"
+        queue = TaskQueue(path)
+        queue._save_now()
+        task = queue.create("https://example.com/v", "/tmp/out", options={"pad": "x" * 70000})
+        queue.flush()
+
+        # 日志超过阈值后被折叠进快照
+        assert path.exists()
+        assert not path.with_suffix(".jsonl").exists()
+        assert TaskQueue(path).get(task.id) is not None
+
+
+class TestStatusQueries:
+    def test_status_transitions(self):
+        queue = TaskQueue()
+        a = queue.create("https://example.com/a", "/tmp/out")
+        b = queue.create("https://example.com/b", "/tmp/out")
+        assert queue.pending() == [a, b]
+
+        a.mark_started()
+        queue.update(a)
+        assert queue.active() == [a]
+        assert queue.pending() == [b]
+
+        a.mark_failed("boom")
+        queue.update(a)
+        assert queue.active() == []
+        assert queue.retryable() == [a]
+
+        assert queue.retry_all_failed() == 1
+        assert queue.failed() == []
+        assert a in queue.pending()
+
+    def test_mark_without_update_is_seen(self):
+        queue = TaskQueue()
+        a = queue.create("https://example.com/a", "/tmp/out")
+        b = queue.create("https://example.com/b", "/tmp/out")
+        a.mark_started()
+        assert queue.active() == [a]
+        assert queue.pending() == [b]
+        a.mark_completed()
+        assert queue.by_status(TaskStatus.DOWNLOADING) == []
+        assert queue.completed() == [a]
+
+    def test_direct_status_assignment_new_status_first(self):
+        queue = TaskQueue()
+        a = queue.create("https://example.com/a", "/tmp/out")
+        b = queue.create("https://example.com/b", "/tmp/out")
+        a.status = TaskStatus.COMPLETED.value
+        # 先查新状态，再查旧状态：任务既不丢失也不重复
+        assert queue.completed() == [a]
+        assert queue.pending() == [b]
+        b.status = TaskStatus.CANCELLED.value
+        assert queue.by_status(TaskStatus.CANCELLED) == [b]
+        assert queue.pending() == []
+
+    def test_pending_keeps_insertion_order(self):
+        queue = TaskQueue()
+        a, b, c = (queue.create(f"https://example.com/{n}", "/tmp/out") for n in "abc")
+        b.status = TaskStatus.QUEUED.value
+        queue.update(b)
+        a.mark_failed("boom")
+        queue.update(a)
+        queue.retry_all_failed()
+        # 重新进入 PENDING 的 a 仍排在最前，PENDING 与 QUEUED 不分组
+        assert queue.pending() == [a, b, c]
+
+    def test_clear_completed(self):
+        queue = TaskQueue()
+        task = queue.create("https://example.com/a", "/tmp/out")
+        task.mark_completed()
+        queue.update(task)
+        assert queue.clear_completed() == 1
+        assert queue.completed() == []
+        assert len(queue) == 0
+
+    def test_status_restored_on_load(self, tmp_path):
+        path = tmp_path / "tasks.json"
+        queue = TaskQueue(path)
+        task = queue.create("https://example.com/a", "/tmp/out")
+        task.mark_completed()
+        queue.update(task)
+        queue.flush()
+        assert [t.id for t in TaskQueue(path).completed()] == [task.id]
+
+
+class TestChangeCallbacks:
+    def test_all_callbacks_run_even_if_one_fails(self):
+        queue = TaskQueue()
+        calls = []
+
+        def broken():
+            raise RuntimeError("boom")
+
+        queue.on_change(lambda: calls.append("a"))
+        queue.on_change(broken)
+        queue.on_change(lambda: calls.append("b"))
+        queue.create("https://example.com/a", "/tmp/out")
+        assert calls == ["a", "b"]
@@ -0,0 +1,106 @@
+"""Unit tests for download.features.ThumbnailFeature (embedding and thumbnail cleanup)."""
+
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import pytest
+
+from fluentytdl.download import features  # pyright: ignore[reportMissingImports]
+from fluentytdl.download.features import (  # pyright: ignore[reportMissingImports]
+    DownloadContext,
+    ThumbnailFeature,
+)
+from fluentytdl.processing.thumbnail_embedder import (  # pyright: ignore[reportMissingImports]
+    EmbedResult,
+)
+
+
+class _Signal:
+    def __init__(self):
+        self.messages = []
+
+    def emit(self, msg):
+        self.messages.append(msg)
+
+
+class _Worker:
+    def __init__(self, dest_paths):
+        self.url = "https://example.com/list"
+        self.output_path = None
+        self.dest_paths = set(dest_paths)
+        self.status_msg = _Signal()
+        self.thumbnail_embed_warning = _Signal()
+        self._cancel_event = threading.Event()
+
+
+@pytest.fixture
+def thumb_env(tmp_path, monkeypatch):
+    """若干视频 + 同名封面，嵌入工具替身按文件名决定成功或抛异常。"""
+    videos = []
+    for name in ("a", "b", "c"):
+        (tmp_path / f"{name}.mp4").write_bytes(b"v")
+        (tmp_path / f"{name}.jpg").write_bytes(b"t")
+        videos.append(str(tmp_path / f"{name}.mp4"))
+    monkeypatch.setattr(features.config_manager, "get", lambda k, d=None: d)
+    monkeypatch.setattr(features.thumbnail_embedder, "get_tool_status", lambda: {"ffmpeg": True})
+
+    embedded = []
+
+    def fake_embed(video, thumb, progress_callback=None):
+        if os.path.basename(video) == "a.mp4":
+            raise RuntimeError("boom")
+        embedded.append(os.path.basename(video))
+        return EmbedResult(True, None, "ok")
+
+    monkeypatch.setattr(features.thumbnail_embedder, "embed_thumbnail", fake_embed)
+    return tmp_path, videos, embedded
+
+
+class TestThumbnailFeature:
+    def test_failing_file_does_not_stop_others(self, thumb_env):
+        tmp_path, videos, embedded = thumb_env
+        worker = _Worker(videos)
+        ThumbnailFeature().on_post_process(DownloadContext(worker, {"writethumbnail": True}))
+
+        assert sorted(embedded) == ["b.mp4", "c.mp4"]
+        assert worker.thumbnail_embed_warning.messages == ["封面嵌入失败: a.mp4"]
+
+    def test_thumbnails_cleaned_after_failure(self, thumb_env):
+        tmp_path, videos, _ = thumb_env
+        ThumbnailFeature().on_post_process(
+            DownloadContext(_Worker(videos), {"writethumbnail": True})
+        )
+
+        assert sorted(os.listdir(tmp_path)) == ["a.mp4", "b.mp4", "c.mp4"]
+
+    def test_single_file_failure_is_reported(self, thumb_env):
+        tmp_path, videos, embedded = thumb_env
+        worker = _Worker(videos[:1])
+        ThumbnailFeature().on_post_process(DownloadContext(worker, {"writethumbnail": True}))
+
+        assert embedded == []
+        assert worker.thumbnail_embed_warning.messages == ["封面嵌入失败: a.mp4"]
+        assert not (tmp_path / "a.jpg").exists()
+
+    def test_locate_matches_names_like_the_filesystem(self, tmp_path, monkeypatch):
+        # 模拟 Windows：normcase 不区分大小写时，路径大小写与磁盘不同也应配对成功
+        (tmp_path / "Clip.MP4").write_bytes(b"v")
+        (tmp_path / "Clip.JPG").write_bytes(b"t")
+        monkeypatch.setattr(features.os.path, "normcase", str.lower)
+        video = str(tmp_path / "clip.mp4")
+        ctx = DownloadContext(_Worker([video]), {"writethumbnail": True})
+
+        assert ThumbnailFeature()._locate_files(ctx) == [(video, str(tmp_path / "clip.jpg"))]
+
+    @pytest.mark.skipif(os.name == "nt", reason="Windows 文件名不区分大小写")
+    def test_locate_is_case_sensitive_where_filesystem_is(self, tmp_path):
+        (tmp_path / "clip.mp4").write_bytes(b"v")
+        (tmp_path / "Clip.jpg").write_bytes(b"t")
+        video = str(tmp_path / "clip.mp4")
+        ctx = DownloadContext(_Worker([video]), {"writethumbnail": True})
+
+        # 精确匹配不到封面时退回目录扫描，按文件名主干同样区分大小写
+        assert ThumbnailFeature()._locate_files(ctx) == []
@@ -0,0 +1,171 @@
+"""Unit tests for download.features.VRFeature (EAC conversion and metadata injection)."""
+
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import pytest
+
+from fluentytdl.download import features  # pyright: ignore[reportMissingImports]
+from fluentytdl.download.features import (  # pyright: ignore[reportMissingImports]
+    DownloadContext,
+    VRFeature,
+)
+
+
+class _Signal:
+    def __init__(self):
+        self.messages = []
+
+    def emit(self, msg):
+        self.messages.append(msg)
+
+
+class _Worker:
+    def __init__(self, opts, output_path):
+        self.opts = opts
+        self.url = "https://example.com/vr"
+        self.output_path = output_path
+        self.dest_paths = set()
+        self.status_msg = _Signal()
+        self._proc_ref = None
+        self._cancel_event = threading.Event()
+
+
+@pytest.fixture
+def vr_env(tmp_path, monkeypatch):
+    """一个已下载的 EAC 文件 + 可控的 ffmpeg / 元数据注入替身。"""
+    video = tmp_path / "v.mp4"
+    video.write_bytes(b"eac")
+    config = {"vr_eac_auto_convert": False, "vr_max_resolution": 2160, "vr_keep_source": False}
+    monkeypatch.setattr(features.config_manager, "get", lambda k, d=None: config.get(k, d))
+    monkeypatch.setattr(VRFeature, "_check_ffmpeg_v360", lambda self, exe: True)
+    monkeypatch.setattr(VRFeature, "_build_cmd", lambda self, exe, inp, out: [exe, inp, out])
+
+    ran = []
+
+    def fake_run(self, cmd, ctx, dur):
+        ran.append(cmd)
+        with open(cmd[2], "wb") as f:
+            f.write(b"equi")
+        return True
+
+    monkeypatch.setattr(VRFeature, "_run_ffmpeg", fake_run)
+
+    injected = []
+
+    def fake_inject(src, dst, md, console):
+        injected.append((src, md.projection, md.stereo_mode))
+        with open(src, "rb") as f_in, open(dst, "wb") as f_out:
+            f_out.write(f_in.read() + b"+meta")
+
+    monkeypatch.setattr(features.metadata_utils, "inject_metadata", fake_inject)
+    return video, config, ran, injected
+
+
+def _run(video, merged, task_opts=None):
+    worker = _Worker(task_opts or {}, str(video))
+    VRFeature().on_post_process(DownloadContext(worker, merged))
+    return worker
+
+
+_MERGED = {
+    "__fluentytdl_use_android_vr": True,
+    "__vr_projection": "eac",
+    "__vr_convert_eac": True,
+    "__vr_stereo_mode": "stereo_tb",
+    "height": 2160,
+}
+
+
+class TestVRFeature:
+    def test_converts_and_injects(self, vr_env):
+        video, _, ran, injected = vr_env
+        _run(video, dict(_MERGED))
+        assert len(ran) == 1
+        assert video.read_bytes() == b"equi+meta"
+        assert injected == [(str(video), "equirectangular", "top-bottom")]
+        assert not (video.parent / "v_equi.mp4").exists()
+        assert not (video.parent / "v.mp4.tmp.mp4").exists()
+
+    def test_flag_only_in_task_opts_is_ignored(self, vr_env):
+        video, _, ran, injected = vr_env
+        # 只认合并后的 opts；任务原始选项中的标记在合并时已被剔除，不启用 VR 后处理
+        merged = {k: v for k, v in _MERGED.items() if k != "__fluentytdl_use_android_vr"}
+        _run(video, merged, {"__fluentytdl_use_android_vr": True})
+        assert ran == [] and injected == []
+        assert video.read_bytes() == b"eac"
+
+    def test_keep_source_backs_up_eac(self, vr_env):
+        video, config, _, _ = vr_env
+        config["vr_keep_source"] = True
+        _run(video, dict(_MERGED))
+        assert (video.parent / "v.eac.mp4").read_bytes() == b"eac"
+        assert video.read_bytes() == b"equi+meta"
+
+    def test_failed_conversion_cleans_up_and_keeps_projection(self, vr_env, monkeypatch):
+        video, _, _, injected = vr_env
+
+        def failing_run(self, cmd, ctx, dur):
+            with open(cmd[2], "wb") as f:
+                f.write(b"partial")
+            return False
+
+        monkeypatch.setattr(VRFeature, "_run_ffmpeg", failing_run)
+        worker = _run(video, dict(_MERGED))
+        assert not (video.parent / "v_equi.mp4").exists()
+        assert "⚠️ VR 转码失败" in worker.status_msg.messages
+        # 未转换：投影仍是 EAC，只注入立体模式
+        assert injected == [(str(video), None, "top-bottom")]
+        assert video.read_bytes() == b"eac+meta"
+
+    def test_non_mp4_skips_injection(self, vr_env, tmp_path):
+        _, _, ran, injected = vr_env
+        video = tmp_path / "v.mkv"
+        video.write_bytes(b"eac")
+        _run(video, dict(_MERGED))
+        assert len(ran) == 1
+        assert injected == []
+        assert video.read_bytes() == b"equi"
+
+    def test_injection_without_output_is_quiet(self, vr_env, monkeypatch):
+        video, _, _, _ = vr_env
+        errors = []
+        monkeypatch.setattr(
+            features.metadata_utils, "inject_metadata", lambda src, dst, md, console: None
+        )
+        monkeypatch.setattr(features.logger, "exception", lambda *a, **k: errors.append(a))
+        worker = _run(video, dict(_MERGED))
+        assert errors == []
+        assert "VR 元数据注入成功" not in worker.status_msg.messages
+        assert video.read_bytes() == b"equi"
+
+    def test_injection_error_is_logged_and_cleaned(self, vr_env, monkeypatch):
+        video, _, _, _ = vr_env
+        errors = []
+
+        def broken_inject(src, dst, md, console):
+            with open(dst, "wb") as f:
+                f.write(b"half")
+            raise ValueError("bad atom")
+
+        monkeypatch.setattr(features.metadata_utils, "inject_metadata", broken_inject)
+        monkeypatch.setattr(features.logger, "exception", lambda *a, **k: errors.append(a))
+        _run(video, dict(_MERGED))
+        assert len(errors) == 1
+        assert not (video.parent / "v.mp4.tmp.mp4").exists()
+        assert video.read_bytes() == b"equi"
+
+
+class TestResolveFfmpeg:
+    def test_directory_created_later_is_picked_up(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(VRFeature, "_resolved_ffmpeg", {})
+        location = str(tmp_path / "ffmpeg")
+        feature = VRFeature()
+
+        assert feature._resolve_ffmpeg(location) == location
+        os.mkdir(location)
+        assert feature._resolve_ffmpeg(location) == os.path.join(location, "ffmpeg.exe")
+        assert VRFeature._resolved_ffmpeg == {location: os.path.join(location, "ffmpeg.exe")}